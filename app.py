@@ -9,6 +9,7 @@ import uvicorn
 import logging
 
 from src.api import search, cart, lists, recipes, health, auth, images, favorites, store
+from src.utils.responses import OrjsonResponse
 from config.settings import settings
 from contextlib import asynccontextmanager
 
@@ -38,19 +39,23 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown (if needed)
+    # Shutdown
     logger.info("👋 Shutting down Wegmans Shopping App")
+    for router_module in (search, recipes, images):
+        await router_module.scraper.aclose()
 
 # Initialize FastAPI with lifespan
 app = FastAPI(
     title="Wegmans Shopping App",
     version="1.0.0",
     docs_url="/api/docs" if settings.DEBUG else None,
+    default_response_class=OrjsonResponse,
     lifespan=lifespan
 )
 
 # Add rate limiting
 app.state.limiter = limiter
+app.state.settings = settings
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS (for development)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from src.database import (
     get_user_cart,
@@ -15,6 +15,8 @@ from src.auth import get_current_user_optional, AuthUser
 router = APIRouter()
 
 class AddToCartRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     name: str
     price: str
     quantity: float = 1.0  # Supports decimals for weight
@@ -26,6 +28,8 @@ class AddToCartRequest(BaseModel):
     sell_by_unit: str = "Each"  # Unit name for display (lb, oz, pkg, Each, etc.)
 
 class UpdateQuantityRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     cart_item_id: int
     quantity: float
 
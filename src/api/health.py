@@ -1,20 +1,34 @@
 from fastapi import APIRouter
 from datetime import datetime
+from functools import lru_cache
+from time import monotonic
 from src.database import get_db
 
 router = APIRouter()
 
-@router.get("/health")
-async def health_check():
-    """Health check endpoint for monitoring"""
-    
-    # Check database connectivity
+
+@lru_cache(maxsize=4)
+def _db_status(second: int) -> str:
+    """
+    Ping the database, memoized per second of the monotonic clock
+
+    Call as _db_status(int(monotonic())) so bursts of health checks
+    share one SELECT 1. Use _db_status.cache_clear() to force a fresh ping.
+    """
     try:
         with get_db() as cursor:
             cursor.execute("SELECT 1")
-        db_status = "ok"
+        return "ok"
     except Exception as e:
-        db_status = f"error: {str(e)}"
+        return f"error: {str(e)}"
+
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint for monitoring"""
+    
+    # Check database connectivity (at most one ping per second)
+    db_status = _db_status(int(monotonic()))
     
     return {
         "status": "ok" if db_status == "ok" else "degraded",
@@ -6,11 +6,18 @@ from pydantic import BaseModel
 from typing import List
 from src.auth import get_current_user_optional, AuthUser
 from src.scraper.algolia_direct import AlgoliaDirectScraper
+import asyncio
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Shared scraper so its pooled HTTP session is reused across requests
+scraper = AlgoliaDirectScraper()
+
+# Maximum concurrent Algolia lookups per request
+MAX_CONCURRENT_FETCHES = 10
+
 
 class ImageFetchRequest(BaseModel):
     product_names: List[str]  # List of product names to fetch images for
@@ -49,38 +56,32 @@ async def fetch_images(
             detail="Maximum 20 products per request"
         )
 
-    scraper = AlgoliaDirectScraper()
     results = []
     success_count = 0
 
-    for product_name in request.product_names:
-        try:
-            # Search for single product to get image
-            products = scraper.search_products(product_name, max_results=1)
-
-            if products and len(products) > 0:
-                image_url = products[0].get('image')
-                results.append({
-                    "product_name": product_name,
-                    "image_url": image_url,
-                    "success": bool(image_url)
-                })
-                if image_url:
-                    success_count += 1
-            else:
-                results.append({
-                    "product_name": product_name,
-                    "image_url": None,
-                    "success": False
-                })
-
-        except Exception as e:
-            logger.error(f"Failed to fetch image for '{product_name}': {e}")
-            results.append({
-                "product_name": product_name,
-                "image_url": None,
-                "success": False
-            })
+    # Search for each product concurrently (single product per search to get image)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+    async def fetch_one(product_name: str):
+        async with semaphore:
+            try:
+                return await scraper.search_products_async(product_name, max_results=1)
+            except Exception as e:
+                logger.error(f"Image fetch failed for '{product_name}': {e}")
+                return []
+
+    # gather preserves input order, so results line up with product_names
+    batch = await asyncio.gather(*(fetch_one(name) for name in request.product_names))
+
+    for product_name, products in zip(request.product_names, batch):
+        image_url = products[0].get('image') if products else None
+        results.append({
+            "product_name": product_name,
+            "image_url": image_url,
+            "success": bool(image_url)
+        })
+        if image_url:
+            success_count += 1
 
     return {
         "results": results,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from src.database import (
     get_user_lists,
@@ -9,6 +9,7 @@ from src.database import (
     get_db
 )
 from src.auth import get_current_user_optional, AuthUser
+from src.utils.etag import etag_json_response
 
 router = APIRouter()
 
@@ -16,11 +17,16 @@ class SaveListRequest(BaseModel):
     name: str
 
 @router.get("/lists")
-async def get_lists(user: AuthUser = Depends(get_current_user_optional)):
-    """Get all saved lists for user at their default store"""
+async def get_lists(request: Request, user: AuthUser = Depends(get_current_user_optional)):
+    """
+    Get all saved lists for user at their default store
+
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
+    with no body. Clients must revalidate (no-cache) since lists change on save.
+    """
     store_number = get_user_store(str(user.id))
     lists = get_user_lists(str(user.id), store_number)
-    return {"lists": lists}
+    return etag_json_response(request, {"lists": lists})
 
 @router.post("/lists/save")
 async def save_list(save_req: SaveListRequest, user: AuthUser = Depends(get_current_user_optional)):
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from typing import List, Optional
 from src.database import (
     get_user_recipes,
+    get_user_recipe,
+    user_owns_recipe,
     create_recipe,
     save_cart_as_recipe,
     add_item_to_recipe,
@@ -17,12 +19,17 @@ from src.database import (
 from src.auth import get_current_user_optional, AuthUser
 from src.parsers.recipe_parser import parse_recipe_text
 from src.scraper.algolia_direct import AlgoliaDirectScraper
+from src.utils.etag import etag_json_response
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shared scraper so its pooled HTTP session is reused across requests
+scraper = AlgoliaDirectScraper()
+
 class CreateRecipeRequest(BaseModel):
     name: str
     description: Optional[str] = None
@@ -61,12 +68,16 @@ class ImportSearchRequest(BaseModel):
     store_number: int = 86  # Store number from UI (default: Raleigh)
 
 @router.get("/recipes")
-async def get_recipes(user: AuthUser = Depends(get_current_user_optional)):
-    """Get all recipes for user at their default store"""
+async def get_recipes(request: Request, user: AuthUser = Depends(get_current_user_optional)):
+    """
+    Get all recipes for user at their default store
+
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
     user_id = str(user.id)
     store_number = get_user_store(user_id)
     recipes = get_user_recipes(user_id, store_number)
-    return {"recipes": recipes}
+    return etag_json_response(request, {"recipes": recipes})
 
 @router.get("/recipes/{recipe_id}/items")
 async def get_recipe_items(recipe_id: int, user: AuthUser = Depends(get_current_user_optional)):
@@ -75,8 +86,7 @@ async def get_recipe_items(recipe_id: int, user: AuthUser = Depends(get_current_
     store_number = get_user_store(user_id)
 
     # Get recipe and verify ownership
-    recipes = get_user_recipes(user_id, store_number)
-    recipe = next((r for r in recipes if r['id'] == recipe_id), None)
+    recipe = get_user_recipe(user_id, recipe_id, store_number)
 
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -97,12 +107,11 @@ async def save_cart_recipe(recipe_req: SaveCartAsRecipeRequest, user: AuthUser =
     user_id = str(user.id)
     store_number = get_user_store(user_id)
 
-    # Check cart isn't empty
-    cart = get_user_cart(user_id, store_number)
-    if not cart:
-        raise HTTPException(status_code=400, detail="Cart is empty")
-
-    recipe_id = save_cart_as_recipe(user_id, recipe_req.name, store_number, recipe_req.description)
+    # An empty cart is rejected inside the save transaction
+    try:
+        recipe_id = save_cart_as_recipe(user_id, recipe_req.name, store_number, recipe_req.description)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {"success": True, "recipe_id": recipe_id}
 
@@ -113,11 +122,10 @@ async def add_item(recipe_id: int, item_req: AddItemToRecipeRequest, user: AuthU
     store_number = get_user_store(user_id)
 
     # Verify recipe belongs to user at this store
-    recipes = get_user_recipes(user_id, store_number)
-    if not any(r['id'] == recipe_id for r in recipes):
+    if not user_owns_recipe(user_id, recipe_id, store_number):
         raise HTTPException(status_code=404, detail="Recipe not found")
 
-    add_item_to_recipe(recipe_id, {
+    item_id = add_item_to_recipe(recipe_id, {
         'name': item_req.name,
         'price': item_req.price,
         'quantity': item_req.quantity,
@@ -129,7 +137,7 @@ async def add_item(recipe_id: int, item_req: AddItemToRecipeRequest, user: AuthU
         'sell_by_unit': item_req.sell_by_unit
     })
 
-    return {"success": True}
+    return {"success": True, "item_id": item_id}
 
 @router.put("/recipes/items/{item_id}/quantity")
 async def update_item_quantity(item_id: int, qty_req: UpdateRecipeItemQuantityRequest, user: AuthUser = Depends(get_current_user_optional)):
@@ -150,8 +158,7 @@ async def update_recipe_metadata(recipe_id: int, update_req: UpdateRecipeRequest
     store_number = get_user_store(user_id)
 
     # Verify recipe belongs to user at this store
-    recipes = get_user_recipes(user_id, store_number)
-    if not any(r['id'] == recipe_id for r in recipes):
+    if not user_owns_recipe(user_id, recipe_id, store_number):
         raise HTTPException(status_code=404, detail="Recipe not found")
 
     update_recipe(recipe_id, update_req.name, update_req.description)
@@ -236,35 +243,46 @@ async def import_search(
     """
     # Use store_number from request (respects UI selection)
     store_number = request.store_number
-    scraper = AlgoliaDirectScraper()
     results = []
 
-    for ingredient_name in request.ingredients:
-        try:
-            # Use Algolia scraper directly
-            logger.info(f"Searching for ingredient: {ingredient_name} at store {store_number}")
-            products = scraper.search_products(
-                query=ingredient_name,
+    # One Algolia multi-query round trip for every ingredient
+    logger.info(f"Searching for {len(request.ingredients)} ingredients at store {store_number}")
+    try:
+        batch = await scraper.search_products_batch_async(
+            request.ingredients,
+            max_results=request.max_results_per_item,
+            store_number=store_number
+        )
+    except Exception as e:
+        # Retry each ingredient on its own so one bad query only fails that ingredient
+        logger.warning(f"Batch search failed, searching {len(request.ingredients)} ingredients individually: {e}")
+        batch = await asyncio.gather(*(
+            scraper.search_products_async(
+                ingredient_name,
                 max_results=request.max_results_per_item,
                 store_number=store_number
             )
+            for ingredient_name in request.ingredients
+        ), return_exceptions=True)
 
-            results.append({
-                "ingredient": ingredient_name,
-                "matches": products[:request.max_results_per_item],
-                "match_count": len(products)
-            })
-
-            logger.info(f"Found {len(products)} matches for '{ingredient_name}'")
-
-        except Exception as e:
-            logger.warning(f"Search failed for '{ingredient_name}': {e}")
+    for ingredient_name, products in zip(request.ingredients, batch):
+        if isinstance(products, Exception):
+            logger.warning(f"Search failed for '{ingredient_name}': {products}")
             results.append({
                 "ingredient": ingredient_name,
                 "matches": [],
                 "match_count": 0,
-                "error": str(e)
+                "error": str(products)
             })
+            continue
+
+        results.append({
+            "ingredient": ingredient_name,
+            "matches": products[:request.max_results_per_item],
+            "match_count": len(products)
+        })
+
+        logger.info(f"Found {len(products)} matches for '{ingredient_name}'")
 
     return {
         "success": True,
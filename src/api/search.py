@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -19,7 +19,7 @@ limiter = Limiter(key_func=get_remote_address)
 scraper = AlgoliaDirectScraper()
 
 class SearchRequest(BaseModel):
-    search_term: str
+    search_term: str = Field(min_length=1)  # Empty terms fail validation (422) before hitting cache/Algolia
     max_results: int = 20  # Increased from 10 to 20
     offset: int = 0        # For pagination support
     store_number: int = 86 # Default: Raleigh, NC
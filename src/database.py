@@ -491,6 +491,43 @@ def get_user_recipes(user_id: str, store_number: int) -> List[Dict]:
 
         return recipes
 
+def get_user_recipe(user_id: str, recipe_id: int, store_number: int) -> Optional[Dict]:
+    """
+    Get one recipe (with its items) if it belongs to user at specific store
+
+    Returns None for unknown or foreign recipe ids after a single indexed
+    lookup, instead of loading every recipe the user has.
+    """
+    with get_db() as cursor:
+        cursor.execute("""
+            SELECT id, name, description, store_number
+            FROM recipes
+            WHERE id = %s AND user_id = %s AND store_number = %s
+        """, (recipe_id, user_id, store_number))
+        recipe = cursor.fetchone()
+        if not recipe:
+            return None
+
+        cursor.execute("""
+            SELECT id, product_name, price, quantity, aisle, image_url,
+                   search_term, is_sold_by_weight, unit_price, sell_by_unit
+            FROM recipe_items
+            WHERE recipe_id = %s
+            ORDER BY id
+        """, (recipe_id,))
+        recipe['items'] = cursor.fetchall()
+
+        return recipe
+
+def user_owns_recipe(user_id: str, recipe_id: int, store_number: int) -> bool:
+    """Check that a recipe belongs to user at specific store (no items loaded)"""
+    with get_db() as cursor:
+        cursor.execute("""
+            SELECT 1 FROM recipes
+            WHERE id = %s AND user_id = %s AND store_number = %s
+        """, (recipe_id, user_id, store_number))
+        return cursor.fetchone() is not None
+
 def create_recipe(user_id: str, name: str, store_number: int, description: str = None) -> int:
     """Create a new recipe for specific store"""
     with get_db() as cursor:
@@ -509,6 +546,9 @@ def save_cart_as_recipe(user_id: str, name: str, store_number: int, description:
     - Recipe creation and item copy in single transaction
     - If item copy fails, recipe creation is rolled back
     - Prevents orphaned recipes without items
+
+    Raises:
+        ValueError: If the cart is empty (nothing is saved)
     """
     with get_db() as cursor:
         # Step 1: Create recipe WITH store_number
@@ -535,11 +575,15 @@ def save_cart_as_recipe(user_id: str, name: str, store_number: int, description:
             WHERE user_id = %s AND store_number = %s
         """, (recipe_id, user_id, store_number))
 
+        # Nothing copied means an empty cart; raising rolls back the recipe
+        if cursor.rowcount == 0:
+            raise ValueError("Cart is empty")
+
         # Both operations commit together (or rollback together on error)
         return recipe_id
 
-def add_item_to_recipe(recipe_id: int, item: dict):
-    """Add an item to a recipe"""
+def add_item_to_recipe(recipe_id: int, item: dict) -> int:
+    """Add an item to a recipe, returning the new item's id"""
     with get_db() as cursor:
         price_str = item['price'].replace('$', '') if isinstance(item['price'], str) else str(item['price'])
 
@@ -548,6 +592,7 @@ def add_item_to_recipe(recipe_id: int, item: dict):
             (recipe_id, product_name, price, quantity, aisle, image_url,
              search_term, is_sold_by_weight, unit_price, sell_by_unit)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
         """, (
             recipe_id,
             item['name'],
@@ -560,6 +605,7 @@ def add_item_to_recipe(recipe_id: int, item: dict):
             item.get('unit_price'),
             item.get('sell_by_unit', 'Each')
         ))
+        return cursor.fetchone()['id']
 
 def update_recipe_item_quantity(recipe_item_id: int, quantity: float):
     """Update item quantity in recipe"""
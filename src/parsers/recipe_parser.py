@@ -9,7 +9,9 @@ Extracts clean ingredient names from recipe text containing:
 - Brand names (King Arthur, McCormick, etc.)
 """
 
+import copy
 import re
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 # Prep words to remove (common cooking preparation terms)
@@ -82,6 +84,16 @@ QUALITY_WORDS = {
     'preferably', 'freshly', 'freshly-ground',
 }
 
+# All descriptor/prep words in one set, used to score "or" alternatives
+_JUNK_WORDS = frozenset(SIZE_WORDS | COLOR_WORDS | QUALITY_WORDS | PREP_WORDS)
+
+# Size/quality words are always removed from the final name
+_SIZE_QUALITY_WORDS = frozenset(SIZE_WORDS | QUALITY_WORDS)
+
+# Vegetables where color is JUST a descriptor (can be removed). For anything
+# else the color is a PRODUCT TYPE and is kept (onion, beans, olives, rice)
+_REMOVE_COLOR_FOR = frozenset({'pepper', 'peppers', 'bell', 'cabbage', 'squash'})
+
 # Bullet patterns (unicode checkboxes, bullets, numbers)
 BULLET_PATTERNS = [
     # Checkboxes
@@ -94,6 +106,60 @@ BULLET_PATTERNS = [
     r'^[\s]*\d+[\.\)\-]\s*',
 ]
 
+_BULLET_RES = tuple(re.compile(p) for p in BULLET_PATTERNS)
+
+# Quick measurement check used to tell "2 cups:" ingredients apart from headers
+_HEADER_MEASUREMENT_RE = re.compile(r'\d+[\s\-]*(?:\/\d+)?\s*(?:cups?|tbsp?|tsp?|oz|lbs?|g|kg)', re.IGNORECASE)
+
+# Generic headers to skip ("Ingredients:", "You'll need:")
+_GENERIC_HEADERS = frozenset({
+    'ingredients', 'you will need', "you'll need", 'you\u2019ll need',
+    'what you need', 'shopping list', 'supplies', 'grocery list',
+    'directions', 'instructions', 'steps', 'method', 'preparation',
+})
+
+# Common single-word ingredients we're highly confident about
+_COMMON_SINGLE = frozenset({
+    'salt', 'pepper', 'sugar', 'flour', 'butter', 'milk', 'water',
+    'eggs', 'egg', 'garlic', 'onion', 'tomato', 'cheese', 'rice',
+    'oil', 'vinegar', 'lemon', 'lime', 'parsley', 'basil', 'oregano',
+    'chicken', 'beef', 'pork', 'fish', 'salmon', 'shrimp', 'bacon',
+    'pasta', 'bread', 'potato', 'carrot', 'celery', 'spinach',
+})
+
+# Ingredient-name cleanup patterns (compiled once, used by clean_ingredient_name)
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_BRACKET_RE = re.compile(r'\[[^\]]*\]')
+_SUCH_AS_RE = re.compile(r'\s+such\s+as\s+', re.IGNORECASE)
+_OR_RE = re.compile(r'\s+or\s+', re.IGNORECASE)
+_AND_RE = re.compile(r'\s+and\s+', re.IGNORECASE)
+_SEPARATOR_RE = re.compile(r'[,]|\s+[\-–—]\s+')  # comma, or dash with spaces around it
+_EACH_PREFIX_RE = re.compile(r'^each[\s:]+', re.IGNORECASE)
+# All brands in one pass (longest first so no brand is cut short by a shorter one)
+_BRAND_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(b) for b in sorted(BRANDS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# Section header prefixes ("For the Sauce:" → "Sauce")
+_FOR_THE_RE = re.compile(r'^for\s+the\s+', re.IGNORECASE)
+_FOR_RE = re.compile(r'^for\s+', re.IGNORECASE)
+
+# Trailing phrases to cut ("plus more for serving", "to taste", "See Note"),
+# applied in order; each pattern contains one of _TRAILING_PHRASE_KEYS
+_TRAILING_PHRASE_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\s+plus\s+.*$',
+    r'\s+for\s+.*$',
+    r'\s+to\s+taste.*$',
+    r'\s+as\s+needed.*$',
+    r'\s+by\s+hand.*$',
+    r'\s+with\s+.*$',
+    r'\s+omit\s+.*$',
+    r'[\.]\s*See\s+Note.*$',
+    r'\s+See\s+Note.*$',
+))
+_TRAILING_PHRASE_KEYS = ('plus', 'for', 'taste', 'needed', 'hand', 'with', 'omit', 'note')
+
 # Measurement units (for extraction, not conversion)
 UNITS = {
     'volume': [
@@ -129,6 +195,23 @@ UNITS = {
     ]
 }
 
+# All units, longest first so "tablespoons" wins over "t" in the regex alternation
+_UNITS_SORTED = tuple(sorted({u for units in UNITS.values() for u in units}, key=lambda u: (-len(u), u)))
+_UNITS_LOWER = frozenset(u.lower() for u in _UNITS_SORTED)
+_UNITS_PATTERN = '|'.join(re.escape(u) for u in _UNITS_SORTED)
+
+# Leading measurement: "2 tablespoons", "1 (15 ounce) can", "2 tbsp to ¼ cup"
+_MEASUREMENT_RE = re.compile(
+    rf'^[\d\s\/\.\-\+~¼½¾⅓⅔⅛⅜⅝⅞]+\s*(\([^)]*\))?\s*({_UNITS_PATTERN})?\.?\s+(to\s+[\d\s\/\.\-\+~¼½¾⅓⅔⅛⅜⅝⅞]+\s*({_UNITS_PATTERN})?\.?\s*)?',
+    re.IGNORECASE
+)
+
+# Trailing measurement: "crushed tomatoes 1 can"
+_TRAILING_MEASUREMENT_RE = re.compile(rf'\s+[\d\s\/\.\-]+\s*({_UNITS_PATTERN})\s*$', re.IGNORECASE)
+
+# "X of Y" patterns: "zest of 1 lemon", "juice of 2 lemons"
+_OF_MEASUREMENT_RE = re.compile(r'^[a-zA-Z\s]+\s+of\s+\d+\s+', re.IGNORECASE)
+
 
 def parse_recipe_text(text: str) -> List[Dict]:
     """
@@ -149,7 +232,16 @@ def parse_recipe_text(text: str) -> List[Dict]:
             },
             ...
         ]
+
+    Results are cached by text; each call returns its own copy so callers
+    can mutate the dicts freely.
     """
+    return copy.deepcopy(_parse_recipe_text_cached(text))
+
+
+@lru_cache(maxsize=1024)
+def _parse_recipe_text_cached(text: str) -> List[Dict]:
+    """Parse recipe text (cached - never mutate the returned list)"""
     lines = text.strip().split('\n')
     ingredients = []
     current_section = None
@@ -208,29 +300,22 @@ def parse_ingredient_line(line: str) -> Optional[Dict]:
     # Also handle ranges: "2 tablespoons to ¼ cup"
     # Also handle "zest and juice of 1 lemon" → look for "of X" patterns
 
-    # Build regex from all units
-    all_units = []
-    for unit_list in UNITS.values():
-        all_units.extend(unit_list)
-    units_pattern = '|'.join(re.escape(u) for u in sorted(all_units, key=len, reverse=True))
-
-    # Add word boundary to units so "1 g" in "1 green" doesn't match "1 gram"
-    # Also handle range patterns: "2 tbsp to ¼ cup"
-    # Also handle "1 (15 ounce) can" where unit comes after parenthetical
-    measurement_pattern = rf'^[\d\s\/\.\-\+~¼½¾⅓⅔⅛⅜⅝⅞]+\s*(\([^)]*\))?\s*({units_pattern})?\.?\s+(to\s+[\d\s\/\.\-\+~¼½¾⅓⅔⅛⅜⅝⅞]+\s*({units_pattern})?\.?\s*)?'
-    measurement_match = re.match(measurement_pattern, cleaned, re.IGNORECASE)
+    # Units must be followed by whitespace so "1 g" in "1 green" doesn't match "1 gram"
+    # (patterns are compiled once at module load - see _MEASUREMENT_RE)
+    measurement_match = _MEASUREMENT_RE.match(cleaned)
 
     if measurement_match:
         # Remove measurement, keep rest
         ingredient_text = cleaned[measurement_match.end():].strip()
 
         # Check for ANOTHER measurement pattern (e.g., "crushed tomatoes 1 can")
-        # Remove trailing measurements too
-        trailing_measurement = rf'\s+[\d\s\/\.\-]+\s*({units_pattern})\s*$'
-        ingredient_text = re.sub(trailing_measurement, '', ingredient_text, flags=re.IGNORECASE)
+        # Remove trailing measurements too (only worth a regex if the last word is a unit)
+        last_word = ingredient_text.rsplit(None, 1)[-1] if ingredient_text else ''
+        if last_word.lstrip('0123456789/.-').lower() in _UNITS_LOWER:
+            ingredient_text = _TRAILING_MEASUREMENT_RE.sub('', ingredient_text)
     else:
         # Check for "X of Y" patterns (e.g., "zest of 1 lemon", "juice of 2 lemons")
-        of_match = re.match(r'^[a-zA-Z\s]+\s+of\s+\d+\s+', cleaned, re.IGNORECASE)
+        of_match = _OF_MEASUREMENT_RE.match(cleaned)
         if of_match:
             # Extract just the ingredient name after the number
             ingredient_text = cleaned[of_match.end():].strip()
@@ -258,11 +343,16 @@ def parse_ingredient_line(line: str) -> Optional[Dict]:
 def strip_bullets(text: str) -> str:
     """Remove all bullet types (▢, •, *, -, 1., etc.)"""
     cleaned = text
-    for pattern in BULLET_PATTERNS:
-        cleaned = re.sub(pattern, '', cleaned)
+    for pattern in _BULLET_RES:
+        cleaned = pattern.sub('', cleaned)
     return cleaned.strip()
 
 
+def _count_junk(text: str) -> int:
+    """Count descriptor/prep words in text (fewer = cleaner ingredient)"""
+    return sum(1 for w in text.split() if w.lower().strip('.,;:-') in _JUNK_WORDS)
+
+
 def clean_ingredient_name(text: str) -> str:
     """
     Clean ingredient name for Wegmans search.
@@ -278,10 +368,13 @@ def clean_ingredient_name(text: str) -> str:
     cleaned = text
 
     # Remove parenthetical notes: "(optional)", "(15oz)", "(King Arthur)"
-    cleaned = re.sub(r'\([^)]*\)', '', cleaned)
+    # (cheap substring guards skip the regex engine for most lines)
+    if '(' in cleaned:
+        cleaned = _PAREN_RE.sub('', cleaned)
 
     # Remove bracketed notes: "[optional]", "[15oz]"
-    cleaned = re.sub(r'\[[^\]]*\]', '', cleaned)
+    if '[' in cleaned:
+        cleaned = _BRACKET_RE.sub('', cleaned)
 
     # Remove trailing prep instructions (after commas or dashes WITH SPACES)
     # "marinated, quartered artichokes, drained" → "marinated quartered artichokes"
@@ -289,9 +382,9 @@ def clean_ingredient_name(text: str) -> str:
     # But DON'T split hyphenated words like "store-bought", "well-done"
 
     # Handle commas and dashes (with spaces) as separators
-    separator_pattern = r'[,]|\s+[\-–—]\s+'  # comma, or dash with spaces around it
-    if re.search(separator_pattern, cleaned):
-        parts = [p.strip() for p in re.split(separator_pattern, cleaned)]
+    parts = _SEPARATOR_RE.split(cleaned)
+    if len(parts) > 1:
+        parts = [p.strip() for p in parts]
         # Keep only parts that have non-prep words
         kept_parts = []
         for part in parts:
@@ -304,30 +397,20 @@ def clean_ingredient_name(text: str) -> str:
         cleaned = ' '.join(kept_parts)
 
     # Remove "each:" or "each " prefix (as in "each: ground cumin")
-    cleaned = re.sub(r'^each[\s:]+', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _EACH_PREFIX_RE.sub('', cleaned)
 
     # Handle "such as" phrases - remove everything after
     if ' such as ' in cleaned.lower():
-        cleaned = re.split(r'\s+such\s+as\s+', cleaned, flags=re.IGNORECASE)[0]
+        cleaned = _SUCH_AS_RE.split(cleaned)[0]
 
     # Handle "or" alternatives
     # Strategy: Prefer the part that looks most like a complete ingredient name
     if ' or ' in cleaned.lower():
-        parts = re.split(r'\s+or\s+', cleaned, flags=re.IGNORECASE)
-
-        # Count non-descriptor words in each part (the actual ingredient words)
-        def count_descriptor_words(text):
-            words = text.split()
-            return sum(1 for w in words if w.lower().strip('.,;:-') in SIZE_WORDS or w.lower().strip('.,;:-') in COLOR_WORDS or w.lower().strip('.,;:-') in QUALITY_WORDS)
-
-        first_descriptors = count_descriptor_words(parts[0])
-        last_descriptors = count_descriptor_words(parts[-1])
-        first_prep = sum(1 for w in parts[0].split() if w.lower().strip('.,;:-') in PREP_WORDS)
-        last_prep = sum(1 for w in parts[-1].split() if w.lower().strip('.,;:-') in PREP_WORDS)
+        parts = _OR_RE.split(cleaned)
 
         # Prefer the part with fewer descriptor/prep words (cleaner ingredient)
-        first_junk = first_descriptors + first_prep
-        last_junk = last_descriptors + last_prep
+        first_junk = _count_junk(parts[0])
+        last_junk = _count_junk(parts[-1])
 
         if last_junk < first_junk:
             cleaned = parts[-1]
@@ -344,105 +427,59 @@ def clean_ingredient_name(text: str) -> str:
     # Handle "and" for compound ingredients - if it looks like TWO ingredients, take first
     # But avoid splitting things like "salt and pepper" where both are spices
     if ' and ' in cleaned.lower():
-        parts = re.split(r'\s+and\s+', cleaned, flags=re.IGNORECASE)
+        parts = _AND_RE.split(cleaned)
         # Take first part (e.g., "salt and pepper" → "salt", "zest and juice" → "zest")
         # This is imperfect but better than keeping the whole phrase
         if len(parts[0].split()) <= 3:  # Only split if first part is reasonable length
             cleaned = parts[0]
 
-    # Remove "plus more for" type phrases
-    cleaned = re.sub(r'\s+plus\s+.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+for\s+.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+to\s+taste.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+as\s+needed.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+by\s+hand.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+with\s+.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+omit\s+.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'[\.]\s*See\s+Note.*$', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+See\s+Note.*$', '', cleaned, flags=re.IGNORECASE)
+    # Remove "plus more for" type phrases (only if one of their keywords is present)
+    cleaned_lower = cleaned.lower()
+    if any(key in cleaned_lower for key in _TRAILING_PHRASE_KEYS):
+        for pattern in _TRAILING_PHRASE_RES:
+            cleaned = pattern.sub('', cleaned)
 
     # Remove brand names (case insensitive)
-    for brand in BRANDS:
-        cleaned = re.sub(r'\b' + re.escape(brand) + r'\b', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _BRAND_RE.sub('', cleaned)
+
+    # Single pass over the words: split once, filter, join once
+    words = [(w, w.lower().strip('.,;:')) for w in cleaned.split()]
 
     # Remove prep words, but keep product descriptors in first position
     # (e.g., "ground beef", "crushed tomatoes" - keep "ground" and "crushed")
-    words = cleaned.split()
     if len(words) > 1:
-        first_word_lower = words[0].lower().strip('.,;:')
-
-        # Check if first word is a product descriptor
-        if first_word_lower in PRODUCT_DESCRIPTORS:
-            # Keep first word as product descriptor
-            filtered_words = [words[0]]
-        else:
-            # Filter first word like any other
-            filtered_words = []
-            if first_word_lower not in PREP_WORDS:
-                filtered_words.append(words[0])
-
-        # Filter rest of words
-        for w in words[1:]:
-            w_lower = w.lower().strip('.,;:')
-            if w_lower not in PREP_WORDS and len(w_lower) > 0:
-                filtered_words.append(w)
-
-        cleaned = ' '.join(filtered_words)
-    else:
-        # Single word, keep it
-        cleaned = ' '.join(words)
+        first_word_lower = words[0][1]
+        keep_first = first_word_lower in PRODUCT_DESCRIPTORS or first_word_lower not in PREP_WORDS
+        words = ([words[0]] if keep_first else []) + [
+            (w, w_clean) for w, w_clean in words[1:]
+            if w_clean not in PREP_WORDS and len(w_clean) > 0
+        ]
 
     # Remove size/color/quality descriptors by word filtering
-    words = cleaned.split()
     filtered_words = []
-
-    # Vegetables where color is JUST a descriptor (can be removed)
-    REMOVE_COLOR_FOR = {'pepper', 'peppers', 'bell', 'cabbage', 'squash'}
-
-    # Vegetables where color is a PRODUCT TYPE (must be kept)
-    KEEP_COLOR_FOR = {'onion', 'onions', 'beans', 'olives', 'rice'}
-
-    for i, w in enumerate(words):
-        w_clean = w.lower().strip('.,;:')
-
-        # Check if this is a color word
-        is_color = w_clean in COLOR_WORDS
-
-        if is_color:
-            next_word = words[i+1].lower().strip('.,;:') if i+1 < len(words) else ''
-
-            # Remove color only if next word is in REMOVE_COLOR_FOR list
-            if next_word in REMOVE_COLOR_FOR:
-                # Skip this color word (e.g., "green" in "green bell pepper")
-                continue
-            else:
-                # Keep it (e.g., "white" in "white onion", "black" in "black beans")
+    for i, (w, w_clean) in enumerate(words):
+        if w_clean in COLOR_WORDS:
+            next_word = words[i+1][1] if i+1 < len(words) else ''
+
+            # Remove color only if next word is in _REMOVE_COLOR_FOR
+            # (e.g., "green" in "green bell pepper"), otherwise keep it
+            # (e.g., "white" in "white onion", "black" in "black beans")
+            if next_word not in _REMOVE_COLOR_FOR:
                 filtered_words.append(w)
-        elif w_clean not in SIZE_WORDS and w_clean not in QUALITY_WORDS:
+        elif w_clean not in _SIZE_QUALITY_WORDS:
             filtered_words.append(w)
 
-    cleaned = ' '.join(filtered_words)
-
-    # Normalize whitespace
-    cleaned = ' '.join(cleaned.split())
-
-    # Remove leading/trailing punctuation
-    cleaned = cleaned.strip('.,;:-')
+    # Join once (also normalizes whitespace), remove leading/trailing punctuation
+    cleaned = ' '.join(filtered_words).strip('.,;:-')
 
     return cleaned.strip()
 
 
 def is_section_header(line: str) -> bool:
     """Detect section headers like 'For the Sauce:' or 'Toppings:'"""
-    # Ends with colon, no measurements
-    if line.endswith(':'):
-        # Check if line has measurements (if so, it's an ingredient)
-        has_measurement = bool(re.search(r'\d+[\s\-]*(\/\d+)?\s*(cups?|tbsp?|tsp?|oz|lbs?|g|kg)', line, re.IGNORECASE))
-        # Check if it's too long (likely not a header)
-        if len(line) > 50:
-            return False
-        return not has_measurement
-    return False
+    # Ends with colon, not too long (likely not a header), no measurements
+    # (if it has a measurement, it's an ingredient)
+    return line.endswith(':') and len(line) <= 50 and not _HEADER_MEASUREMENT_RE.search(line)
 
 
 def extract_section_name(line: str) -> str:
@@ -450,20 +487,14 @@ def extract_section_name(line: str) -> str:
     # "For the Sauce:" → "Sauce"
     # "Toppings:" → "Toppings"
     cleaned = line.rstrip(':').strip()
-    cleaned = re.sub(r'^for\s+the\s+', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'^for\s+', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _FOR_THE_RE.sub('', cleaned)
+    cleaned = _FOR_RE.sub('', cleaned)
     return cleaned.title()
 
 
 def is_generic_header(line: str) -> bool:
     """Detect generic headers to skip"""
-    line_lower = line.lower().strip().rstrip(':')
-    generic = [
-        'ingredients', 'you will need', "you'll need", 'you\'ll need',
-        'what you need', 'shopping list', 'supplies', 'grocery list',
-        'directions', 'instructions', 'steps', 'method', 'preparation',
-    ]
-    return line_lower in generic
+    return line.lower().strip().rstrip(':') in _GENERIC_HEADERS
 
 
 def assess_confidence(name: str) -> str:
@@ -476,14 +507,7 @@ def assess_confidence(name: str) -> str:
         return 'low'
 
     # High confidence: common single-word ingredients
-    common_single = [
-        'salt', 'pepper', 'sugar', 'flour', 'butter', 'milk', 'water',
-        'eggs', 'egg', 'garlic', 'onion', 'tomato', 'cheese', 'rice',
-        'oil', 'vinegar', 'lemon', 'lime', 'parsley', 'basil', 'oregano',
-        'chicken', 'beef', 'pork', 'fish', 'salmon', 'shrimp', 'bacon',
-        'pasta', 'bread', 'potato', 'carrot', 'celery', 'spinach',
-    ]
-    if name.lower() in common_single:
+    if name.lower() in _COMMON_SINGLE:
         return 'high'
 
     # High confidence: 2-3 word ingredients
@@ -2,8 +2,12 @@
 Direct Algolia API scraper - NO BROWSER NEEDED!
 Queries Wegmans' Algolia search index directly via HTTP.
 """
+import httpx
+import orjson
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional
 from config.settings import settings
 
@@ -18,7 +22,25 @@ class AlgoliaDirectScraper:
         self.ALGOLIA_API_KEY = settings.ALGOLIA_API_KEY
         self.ALGOLIA_URL = "https://qgppr19v8v-dsn.algolia.net/1/indexes/*/queries"
         self.STORE_NUMBER = settings.ALGOLIA_STORE_NUMBER
-    
+
+        # Reuse one pooled keep-alive session (skips a TCP+TLS handshake per search)
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # Algolia queries are read-only, so retrying the POST is safe
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"POST"})
+            )
+        ))
+        self._session.headers.update(self._headers())
+
+        # Async HTTP/2 client, created lazily on first async search
+        self._aclient: Optional[httpx.AsyncClient] = None
+
     def search_products(self, query: str, max_results: int = 10, store_number: int = None) -> List[Dict]:
         """
         Search Wegmans products via direct Algolia API call
@@ -35,94 +57,184 @@ class AlgoliaDirectScraper:
         logger.info(f"🚀 Direct Algolia search for '{query}' at store {store}")
 
         # Build request payload
-        payload = {
-            "requests": [{
-                "indexName": "products",
-                "query": query,
-                "hitsPerPage": max_results,
-                "filters": f"storeNumber:{store} AND fulfilmentType:instore"
-            }]
-        }
-        
-        headers = {
-            "x-algolia-api-key": self.ALGOLIA_API_KEY,
-            "x-algolia-application-id": self.ALGOLIA_APP_ID,
-            "Content-Type": "application/json"
-        }
-        
+        payload = {"requests": [self._build_query(query, max_results, store)]}
+
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.ALGOLIA_URL,
                 json=payload,
-                headers=headers,
                 timeout=10
             )
             response.raise_for_status()
-            
-            data = response.json()
+
+            data = orjson.loads(response.content)
             results = data.get('results', [])
-            
+
             if not results:
                 logger.warning("No results from Algolia")
                 return []
-            
+
             hits = results[0].get('hits', [])
             logger.info(f"✅ Got {len(hits)} hits from Algolia")
-            
-            # Extract product data
-            products = []
-            for hit in hits:
-                try:
-                    product = {
-                        'name': hit.get('productName', ''),
-                        'price': self._extract_price(hit),
-                        'aisle': self._extract_aisle(hit),
-                        'image': self._extract_image(hit),
-                        'is_sold_by_weight': hit.get('isSoldByWeight', False),
-                        'unit_price': hit.get('price_inStore', {}).get('unitPrice') if isinstance(hit.get('price_inStore'), dict) else None,
-                        'sell_by_unit': hit.get('onlineSellByUnit', 'Each'),
-                        'approx_weight': hit.get('onlineApproxUnitWeight', 1.0)
-                    }
-                    
-                    if product['name']:
-                        products.append(product)
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing product: {e}")
-                    continue
-            
+
+            products = self._parse_hits(hits)
             logger.info(f"🎯 Returning {len(products)} products")
             return products
-            
+
         except Exception as e:
             logger.error(f"❌ Algolia API call failed: {e}")
             raise
-    
+
+    async def search_products_async(self, query: str, max_results: int = 10, store_number: int = None) -> List[Dict]:
+        """
+        Async variant of search_products
+
+        Concurrent calls (e.g. via asyncio.gather) multiplex over a single
+        HTTP/2 connection instead of blocking the event loop.
+        """
+        store = store_number if store_number is not None else self.STORE_NUMBER
+        logger.info(f"🚀 Direct Algolia async search for '{query}' at store {store}")
+
+        payload = {"requests": [self._build_query(query, max_results, store)]}
+
+        try:
+            response = await self._get_async_client().post(self.ALGOLIA_URL, json=payload)
+            response.raise_for_status()
+
+            results = orjson.loads(response.content).get('results', [])
+            if not results:
+                logger.warning("No results from Algolia")
+                return []
+
+            return self._parse_hits(results[0].get('hits', []))
+
+        except Exception as e:
+            logger.error(f"❌ Algolia async API call failed: {e}")
+            raise
+
+    async def aclose(self):
+        """Close the async client (call on app shutdown)"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    async def search_products_batch_async(self, queries: List[str], max_results: int = 10, store_number: int = None) -> List[List[Dict]]:
+        """
+        Search several terms in a single Algolia multi-query request
+
+        Sent over the shared HTTP/2 client, so async handlers don't block
+        the event loop.
+
+        Args:
+            queries: Search terms
+            max_results: Maximum products to return per query
+            store_number: Wegmans store number (defaults to configured store)
+
+        Returns:
+            One product list per query, in the same order as queries
+        """
+        if not queries:
+            return []
+
+        store = store_number if store_number is not None else self.STORE_NUMBER
+        logger.info(f"🚀 Direct Algolia async batch search for {len(queries)} terms at store {store}")
+
+        payload = {"requests": [self._build_query(q, max_results, store) for q in queries]}
+
+        try:
+            response = await self._get_async_client().post(self.ALGOLIA_URL, json=payload)
+            response.raise_for_status()
+
+            results = orjson.loads(response.content).get('results', [])
+            return self._parse_batch(results, len(queries))
+
+        except Exception as e:
+            logger.error(f"❌ Algolia async batch API call failed: {e}")
+            raise
+
+    def _headers(self) -> Dict[str, str]:
+        """Algolia auth headers shared by the sync and async clients"""
+        return {
+            "x-algolia-api-key": self.ALGOLIA_API_KEY,
+            "x-algolia-application-id": self.ALGOLIA_APP_ID,
+            "Content-Type": "application/json"
+        }
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client, creating it if needed"""
+        if self._aclient is None or self._aclient.is_closed:
+            self._aclient = httpx.AsyncClient(http2=True, timeout=10, headers=self._headers())
+        return self._aclient
+
+    def _build_query(self, query: str, max_results: int, store: int) -> Dict:
+        """Build a single Algolia query for the products index"""
+        return {
+            "indexName": "products",
+            "query": query,
+            "hitsPerPage": max_results,
+            "filters": f"storeNumber:{store} AND fulfilmentType:instore"
+        }
+
+    def _parse_hits(self, hits: List[Dict]) -> List[Dict]:
+        """Extract product data from Algolia hits"""
+        products = []
+        for hit in hits:
+            try:
+                get = hit.get
+                price_in_store = get('price_inStore')
+                product = {
+                    'name': get('productName', ''),
+                    'price': self._extract_price(hit),
+                    'aisle': self._extract_aisle(hit),
+                    'image': self._extract_image(hit),
+                    'is_sold_by_weight': get('isSoldByWeight', False),
+                    'unit_price': price_in_store.get('unitPrice') if isinstance(price_in_store, dict) else None,
+                    'sell_by_unit': get('onlineSellByUnit', 'Each'),
+                    'approx_weight': get('onlineApproxUnitWeight', 1.0)
+                }
+
+                if product['name']:
+                    products.append(product)
+
+            except Exception as e:
+                logger.error(f"Error parsing product: {e}")
+                continue
+
+        return products
+
+    def _parse_batch(self, results: List[Dict], query_count: int) -> List[List[Dict]]:
+        """Parse multi-query results (returned in request order), padding any missing with []"""
+        batch = [self._parse_hits(result.get('hits', [])) for result in results]
+        batch.extend([] for _ in range(query_count - len(batch)))
+        return batch
+
     def _extract_price(self, hit: Dict) -> str:
         """Extract price from hit"""
-        if 'price_inStore' in hit and isinstance(hit['price_inStore'], dict):
-            amount = hit['price_inStore'].get('amount')
-            if amount:
-                return f"${amount:.2f}"
-        return "$0.00"
-    
+        try:
+            amount = hit['price_inStore']['amount']
+        except (KeyError, TypeError):
+            return "$0.00"
+        return f"${amount:.2f}" if amount else "$0.00"
+
     def _extract_aisle(self, hit: Dict) -> str:
         """Extract aisle from hit"""
-        if 'planogram' in hit and isinstance(hit['planogram'], dict):
-            aisle = hit['planogram'].get('aisle')
+        try:
+            aisle = hit['planogram']['aisle']
             if aisle:
                 return str(aisle)
-        
+        except (KeyError, TypeError):
+            pass
+
         # Fallback to categories
-        categories = hit.get('categories', [])
-        if categories:
-            return categories[0] if isinstance(categories[0], str) else "Unknown"
-        
-        return "Unknown"
-    
+        try:
+            category = hit['categories'][0]
+        except (KeyError, IndexError, TypeError):
+            return "Unknown"
+        return category if isinstance(category, str) else "Unknown"
+
     def _extract_image(self, hit: Dict) -> str:
         """Extract image URL from hit"""
-        images = hit.get('images', [])
-        if images and len(images) > 0:
-            return images[0]
-        return ""
+        try:
+            return hit['images'][0]
+        except (KeyError, IndexError, TypeError):
+            return ""
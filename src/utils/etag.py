@@ -0,0 +1,29 @@
+"""
+Conditional GET helpers for per-user JSON endpoints
+"""
+import hashlib
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def etag_json_response(request: Request, content) -> Response:
+    """
+    Serialize content to JSON with an ETag (a hash of the body)
+
+    Returns 304 Not Modified with no body when If-None-Match matches.
+    Clients must revalidate (no-cache) and the response varies per user.
+    """
+    payload = orjson.dumps(jsonable_encoder(content))
+    etag = f'"{hashlib.md5(payload).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization, X-Anonymous-User-ID"
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -0,0 +1,17 @@
+"""
+Response classes shared by the app
+"""
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson
+
+    FastAPI runs jsonable_encoder before rendering, so content is already
+    plain JSON types here. orjson encodes straight to UTF-8 bytes.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
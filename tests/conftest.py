@@ -12,6 +12,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+import httpx
 from fastapi.testclient import TestClient
 from app import app
 from src.database import get_connection_pool
@@ -19,6 +20,69 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 
 
+def pytest_configure(config):
+    """
+    Give each pytest-xdist worker its own database (pytest -n auto)
+
+    The worker database is cloned from TEST_DATABASE_URL (used as a
+    template, so schema and seed data come along) and the app is pointed at
+    it before its connection pool is created. Cloning only happens against
+    an explicit TEST_DATABASE_URL, never the app's DATABASE_URL, so a
+    parallel run can't drop or create databases on a dev or production
+    server. Single-process runs are unaffected.
+    """
+    base_url = os.getenv("TEST_DATABASE_URL")
+    if not base_url and os.getenv("DATABASE_URL") and config.getoption("numprocesses", None):
+        raise pytest.UsageError(
+            "Parallel runs (-n) clone a database per worker and need TEST_DATABASE_URL "
+            "set explicitly; refusing to create databases on DATABASE_URL's server"
+        )
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None or not base_url:
+        return
+
+    from psycopg2.extensions import make_dsn, parse_dsn
+    from config.settings import settings
+
+    template = parse_dsn(base_url)["dbname"]
+    worker_db = f"{template}_{workerinput['workerid']}"
+    worker_url = make_dsn(base_url, dbname=worker_db)
+
+    conn = psycopg2.connect(make_dsn(base_url, dbname="postgres"))
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{worker_db}"')
+        cursor.execute(f'CREATE DATABASE "{worker_db}" TEMPLATE "{template}"')
+    conn.close()
+
+    os.environ["TEST_DATABASE_URL"] = worker_url
+    settings.DATABASE_URL = worker_url
+    config._worker_database = (base_url, worker_db)
+
+
+def pytest_unconfigure(config):
+    """Drop the per-worker database created in pytest_configure"""
+    worker_database = getattr(config, "_worker_database", None)
+    if worker_database is None:
+        return
+
+    from psycopg2.extensions import make_dsn
+    import src.database
+
+    # Release pooled connections so the database can be dropped
+    if src.database._connection_pool is not None:
+        src.database._connection_pool.closeall()
+        src.database._connection_pool = None
+
+    base_url, worker_db = worker_database
+    conn = psycopg2.connect(make_dsn(base_url, dbname="postgres"))
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{worker_db}"')
+    conn.close()
+
+
 @pytest.fixture(scope="session")
 def test_database_url():
     """Get test database URL from environment"""
@@ -28,22 +92,87 @@ def test_database_url():
     return db_url
 
 
+@pytest.fixture(scope="session")
+def _pg_conn(test_database_url):
+    """Single database connection shared by the whole test session"""
+    conn = psycopg2.connect(test_database_url)
+    conn.autocommit = False
+
+    yield conn
+
+    conn.rollback()
+    conn.close()
+
+
 @pytest.fixture(scope="function")
-def db_connection(test_database_url):
+def db_connection(_pg_conn):
     """
-    Provide a database connection with transaction rollback
+    Provide a database cursor with transaction rollback
 
-    Each test gets a fresh connection and all changes are rolled back
+    Reuses the session connection (no connect/auth per test) and rolls back
+    to a savepoint after each test, so all changes are discarded
     """
-    conn = psycopg2.connect(test_database_url)
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    _pg_conn.rollback()
+    cursor = _pg_conn.cursor(cursor_factory=RealDictCursor)
+    cursor.execute("SAVEPOINT test_sp")
 
     yield cursor
 
     # Rollback all changes after test
-    conn.rollback()
+    cursor.execute("ROLLBACK TO SAVEPOINT test_sp")
     cursor.close()
-    conn.close()
+
+
+@pytest.fixture(scope="function")
+def db_txn(request, monkeypatch):
+    """
+    Run the app's database calls inside one transaction, rolled back after the test
+
+    Patches get_db so every query (API handlers and fixtures alike) goes
+    through the shared session connection; each get_db block is a savepoint,
+    so errors behave like the real per-call rollback. Nothing is committed,
+    so tests need no cleanup requests. Without a test database URL this is a
+    no-op and tests use the app's normal connection pool.
+    """
+    if not (os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL")):
+        yield None
+        return
+
+    import threading
+    from contextlib import contextmanager
+    import src.database
+    import src.api.auth
+    import src.api.health
+    import src.api.lists
+
+    conn = request.getfixturevalue("_pg_conn")
+    conn.rollback()
+    # Handlers run on worker threads; serialize their use of the one connection
+    lock = threading.RLock()
+
+    @contextmanager
+    def txn_get_db():
+        with lock:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute("SAVEPOINT get_db")
+            try:
+                yield cursor
+                cursor.execute("RELEASE SAVEPOINT get_db")
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT get_db")
+                raise
+            finally:
+                cursor.close()
+
+    for module in (src.database, src.api.auth, src.api.health, src.api.lists):
+        monkeypatch.setattr(module, "get_db", txn_get_db)
+    src.api.health._db_status.cache_clear()
+
+    yield conn
+
+    # Discard everything the test wrote
+    conn.rollback()
+    src.api.health._db_status.cache_clear()
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -64,21 +193,313 @@ def reset_rate_limiter():
         pass
 
 
+# Run the TestClient portal on uvloop when available (installed with uvicorn[standard])
+try:
+    import uvloop  # noqa: F401
+    BACKEND_OPTIONS = {"use_uvloop": True}
+except ImportError:
+    BACKEND_OPTIONS = {}
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The FastAPI app, imported once per session (for tests that only inspect app state)"""
+    return app
+
+
+@pytest.fixture(scope="session")
+def _test_client():
+    """
+    Single TestClient for the whole session (app startup/shutdown runs once)
+
+    Redirects are returned as-is (the app issues none) and unhandled handler
+    errors come back as 500 responses for tests to assert on.
+    """
+    with TestClient(
+        app,
+        backend="asyncio",
+        backend_options=BACKEND_OPTIONS,
+        follow_redirects=False,
+        raise_server_exceptions=False
+    ) as test_client:
+        yield test_client
+
+
 @pytest.fixture(scope="function")
-def client():
+def client(_test_client):
     """
     FastAPI test client with anonymous user ID
 
     Provides a requests-like interface for testing API endpoints.
     Includes X-Anonymous-User-ID header for consistent user identity across requests.
+    The underlying client is shared; each test gets a fresh anonymous user.
     """
     import uuid
     anonymous_id = str(uuid.uuid4())
 
-    with TestClient(app) as test_client:
-        # Set default headers for all requests
-        test_client.headers = {"X-Anonymous-User-ID": anonymous_id}
-        yield test_client
+    # Set default headers for all requests
+    _test_client.headers = {"X-Anonymous-User-ID": anonymous_id}
+
+    yield _test_client
+
+    # Don't leak identity or cookies into the next test
+    _test_client.headers = {}
+    _test_client.cookies.clear()
+
+
+@pytest.fixture(scope="session")
+def _asgi_transport(_test_client):
+    """
+    Shared in-process transport for async clients
+
+    Depends on the session TestClient so the app lifespan (startup/shutdown)
+    wraps the whole session instead of running per async client.
+    ASGITransport holds no connections, so reusing it across event loops
+    and closing clients over it is safe.
+    """
+    return httpx.ASGITransport(app=app, raise_app_exceptions=True)
+
+
+@pytest.fixture(scope="function")
+def async_client(client, _asgi_transport):
+    """
+    Factory for an in-process async client with the same anonymous user
+
+    Requests run on the caller's event loop via ASGITransport (no portal
+    thread per request). Use inside asyncio.run():
+
+        async with async_client() as ac:
+            response = await ac.get("/api/health")
+    """
+    def make():
+        return httpx.AsyncClient(
+            transport=_asgi_transport,
+            base_url="http://testserver",
+            headers=dict(client.headers)
+        )
+
+    return make
+
+
+@pytest.fixture(scope="function")
+def cart_item(client):
+    """Add one item to the client's cart and return the created cart row (with id)"""
+    response = client.post("/api/cart/add", json={"name": "Test", "price": "$1", "quantity": 1})
+    assert response.status_code == 200, response.text
+    return response.json()["cart"][0]
+
+
+def _seed_user(cursor, user_id):
+    """Insert the anonymous user if missing and return their store number"""
+    cursor.execute("""
+        INSERT INTO users (id, email, is_anonymous, created_at)
+        VALUES (%s, NULL, TRUE, CURRENT_TIMESTAMP)
+        ON CONFLICT (id) DO NOTHING
+    """, (user_id,))
+    cursor.execute("SELECT store_number FROM users WHERE id = %s", (user_id,))
+    return cursor.fetchone()['store_number']
+
+
+# Larger seeds stream through COPY (no per-row parse/plan); small ones use one INSERT
+SEED_COPY_THRESHOLD = 5
+
+
+@pytest.fixture(scope="function")
+def seed_cart(client):
+    """
+    Seed the client's cart directly in the database
+
+    Inserts the anonymous user and all items in one transaction (a single
+    multi-row INSERT, or COPY FROM STDIN above SEED_COPY_THRESHOLD items)
+    instead of one POST /api/cart/add round-trip per item.
+    Returns the new cart item IDs in input order.
+    """
+    import csv
+    import io
+    from psycopg2.extras import execute_values
+
+    user_id = client.headers["X-Anonymous-User-ID"]
+
+    def seed(items):
+        from src.database import get_db
+
+        with get_db() as cursor:
+            store_number = _seed_user(cursor, user_id)
+
+            values = [
+                (user_id, store_number, item['name'], float(item['price'].replace('$', '')),
+                 item.get('quantity', 1), item.get('aisle'))
+                for item in items
+            ]
+            columns = "(user_id, store_number, product_name, price, quantity, aisle)"
+
+            if len(values) <= SEED_COPY_THRESHOLD:
+                rows = execute_values(cursor, f"""
+                    INSERT INTO shopping_carts {columns}
+                    VALUES %s
+                    RETURNING id
+                """, values, fetch=True)
+                return [row['id'] for row in rows]
+
+            # COPY can't return ids; quoted strings keep '' distinct from NULL (None)
+            buffer = io.StringIO()
+            csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(values)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY shopping_carts {columns} FROM STDIN WITH (FORMAT csv)", buffer)
+
+            # Serial ids are assigned in input order within this transaction
+            cursor.execute("""
+                SELECT id FROM shopping_carts WHERE user_id = %s
+                ORDER BY id DESC LIMIT %s
+            """, (user_id, len(values)))
+            return [row['id'] for row in reversed(cursor.fetchall())]
+
+    return seed
+
+
+@pytest.fixture(scope="function")
+def clear_cart(client):
+    """Empty the client's cart directly in the database (skips DELETE /api/cart)"""
+    user_id = client.headers["X-Anonymous-User-ID"]
+
+    def clear():
+        from src.database import get_db
+
+        with get_db() as cursor:
+            cursor.execute("DELETE FROM shopping_carts WHERE user_id = %s", (user_id,))
+
+    return clear
+
+
+@pytest.fixture(scope="function")
+def seed_recipe(client):
+    """
+    Seed a recipe (and its items) for the client's user directly in the database
+
+    One INSERT for the recipe and one multi-row INSERT for its items, instead
+    of a /api/cart/add per item plus /api/recipes/save-cart.
+    Returns (recipe_id, item_ids) with item IDs in input order.
+    """
+    from psycopg2.extras import execute_values
+
+    user_id = client.headers["X-Anonymous-User-ID"]
+
+    def seed(name, items=(), description=None):
+        from src.database import get_db
+
+        with get_db() as cursor:
+            store_number = _seed_user(cursor, user_id)
+            cursor.execute("""
+                INSERT INTO recipes (user_id, store_number, name, description)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id
+            """, (user_id, store_number, name, description))
+            recipe_id = cursor.fetchone()['id']
+
+            if not items:
+                return recipe_id, []
+
+            rows = execute_values(cursor, """
+                INSERT INTO recipe_items (recipe_id, product_name, price, quantity, aisle)
+                VALUES %s
+                RETURNING id
+            """, [
+                (recipe_id, item['name'], float(item['price'].replace('$', '')),
+                 item.get('quantity', 1), item.get('aisle'))
+                for item in items
+            ], fetch=True)
+
+        return recipe_id, [row['id'] for row in rows]
+
+    return seed
+
+
+# Canned Algolia results (already in the scraper's product shape)
+FAKE_SEARCH_PRODUCTS = [
+    {
+        "name": f"Wegmans Bananas {i}",
+        "price": "$0.59",
+        "aisle": "Produce",
+        "image": f"https://example.com/bananas-{i}.jpg",
+        "is_sold_by_weight": True,
+        "unit_price": "$0.59/lb",
+        "sell_by_unit": "lb",
+        "approx_weight": 0.4
+    }
+    for i in range(10)
+]
+
+
+@pytest.fixture(scope="function")
+def fake_search(monkeypatch):
+    """
+    Stub the search router's Algolia scraper with canned results (no network)
+
+    The search cache is bypassed too: reads always miss (so responses are
+    exactly the canned products) and fake products never land in search_cache.
+    """
+    from src.api import search
+
+    def search_products(query, max_results=10, store_number=None):
+        return FAKE_SEARCH_PRODUCTS[:max_results]
+
+    monkeypatch.setattr(search.scraper, "search_products", search_products)
+    monkeypatch.setattr(search, "get_cached_search", lambda *args: None)
+    monkeypatch.setattr(search, "cache_search_results", lambda *args: None)
+    return FAKE_SEARCH_PRODUCTS
+
+
+@pytest.fixture(scope="function")
+def fake_images(monkeypatch):
+    """Stub the image router's Algolia lookups with one canned product per name"""
+    from src.api import images
+
+    async def search_products_async(query, max_results=10, store_number=None):
+        return [{"name": query, "image": f"https://example.com/{query}.jpg"}]
+
+    monkeypatch.setattr(images.scraper, "search_products_async", search_products_async)
+
+
+# Canned per-ingredient results for /api/recipes/import-search; other terms have no matches
+FAKE_INGREDIENT_PRODUCTS = {
+    ingredient: [
+        {**FAKE_SEARCH_PRODUCTS[i], "name": f"Wegmans {ingredient.title()} {i}", "is_sold_by_weight": False}
+        for i in range(5)
+    ]
+    for ingredient in ("olive oil", "chicken", "onion")
+}
+
+
+# Ingredient whose stubbed Algolia search always fails
+FAILING_INGREDIENT = "unavailable"
+
+
+@pytest.fixture(scope="function")
+def fake_import_search(monkeypatch):
+    """
+    Stub the recipe router's Algolia searches with canned results (no network)
+
+    Searching FAILING_INGREDIENT raises, which fails the whole batch request
+    and only that ingredient's per-ingredient retry.
+
+    Returns the list of (queries, max_results, store_number) batch calls made.
+    """
+    from src.api import recipes
+
+    calls = []
+
+    async def search_products_async(query, max_results=10, store_number=None):
+        if query == FAILING_INGREDIENT:
+            raise RuntimeError(f"Search failed for '{query}'")
+        return FAKE_INGREDIENT_PRODUCTS.get(query, [])[:max_results]
+
+    async def search_products_batch_async(queries, max_results=10, store_number=None):
+        calls.append((list(queries), max_results, store_number))
+        return [await search_products_async(q, max_results, store_number) for q in queries]
+
+    monkeypatch.setattr(recipes.scraper, "search_products_async", search_products_async)
+    monkeypatch.setattr(recipes.scraper, "search_products_batch_async", search_products_batch_async)
+    return calls
 
 
 @pytest.fixture
@@ -0,0 +1,116 @@
+"""
+Tests for src/scraper/algolia_direct.py hit parsing
+
+Covers product extraction from raw Algolia hits without any network calls:
+- _extract_price() / _extract_aisle() / _extract_image() fallbacks
+- _parse_hits() product shape and skipping of unnamed hits
+- _parse_batch() multi-query result ordering and padding
+"""
+import pytest
+
+from src.scraper.algolia_direct import AlgoliaDirectScraper
+
+
+@pytest.fixture
+def scraper():
+    """Scraper instance (no requests are made in these tests)"""
+    return AlgoliaDirectScraper()
+
+
+class TestExtractFields:
+    """Test per-field extraction and fallbacks"""
+
+    def test_price_formats_amount(self, scraper):
+        """Price amount is formatted as dollars"""
+        assert scraper._extract_price({'price_inStore': {'amount': 3.5}}) == "$3.50"
+
+    def test_price_missing_or_malformed(self, scraper):
+        """Missing, zero, or non-dict prices fall back to $0.00"""
+        assert scraper._extract_price({}) == "$0.00"
+        assert scraper._extract_price({'price_inStore': {'amount': 0}}) == "$0.00"
+        assert scraper._extract_price({'price_inStore': None}) == "$0.00"
+        assert scraper._extract_price({'price_inStore': "3.50"}) == "$0.00"
+
+    def test_aisle_from_planogram(self, scraper):
+        """Planogram aisle is preferred"""
+        hit = {'planogram': {'aisle': 12}, 'categories': ['Dairy']}
+        assert scraper._extract_aisle(hit) == "12"
+
+    def test_aisle_falls_back_to_category(self, scraper):
+        """Empty or malformed planogram falls back to first category"""
+        assert scraper._extract_aisle({'planogram': {'aisle': None}, 'categories': ['Dairy']}) == "Dairy"
+        assert scraper._extract_aisle({'planogram': [], 'categories': ['Produce']}) == "Produce"
+
+    def test_aisle_unknown(self, scraper):
+        """No planogram and no usable category gives Unknown"""
+        assert scraper._extract_aisle({}) == "Unknown"
+        assert scraper._extract_aisle({'categories': []}) == "Unknown"
+        assert scraper._extract_aisle({'categories': [{'name': 'Dairy'}]}) == "Unknown"
+
+    def test_image_first_or_empty(self, scraper):
+        """First image is used; missing images give empty string"""
+        assert scraper._extract_image({'images': ['a.jpg', 'b.jpg']}) == "a.jpg"
+        assert scraper._extract_image({'images': []}) == ""
+        assert scraper._extract_image({'images': None}) == ""
+        assert scraper._extract_image({}) == ""
+
+
+class TestParseHits:
+    """Test building product dicts from hits"""
+
+    def test_full_hit(self, scraper):
+        """All product fields are extracted"""
+        hit = {
+            'productName': 'Wegmans Bananas',
+            'price_inStore': {'amount': 0.59, 'unitPrice': '$0.59/lb'},
+            'planogram': {'aisle': 'Produce'},
+            'images': ['bananas.jpg'],
+            'isSoldByWeight': True,
+            'onlineSellByUnit': 'lb',
+            'onlineApproxUnitWeight': 0.4,
+        }
+
+        products = scraper._parse_hits([hit])
+
+        assert products == [{
+            'name': 'Wegmans Bananas',
+            'price': '$0.59',
+            'aisle': 'Produce',
+            'image': 'bananas.jpg',
+            'is_sold_by_weight': True,
+            'unit_price': '$0.59/lb',
+            'sell_by_unit': 'lb',
+            'approx_weight': 0.4,
+        }]
+
+    def test_defaults_for_sparse_hit(self, scraper):
+        """Sparse hits get default values"""
+        products = scraper._parse_hits([{'productName': 'Milk'}])
+
+        assert products[0]['price'] == '$0.00'
+        assert products[0]['aisle'] == 'Unknown'
+        assert products[0]['unit_price'] is None
+        assert products[0]['sell_by_unit'] == 'Each'
+        assert products[0]['approx_weight'] == 1.0
+
+    def test_skips_unnamed_hits(self, scraper):
+        """Hits without a product name are dropped"""
+        products = scraper._parse_hits([{'productName': ''}, {}, {'productName': 'Bread'}])
+
+        assert [p['name'] for p in products] == ['Bread']
+
+
+class TestParseBatch:
+    """Test splitting multi-query results per query"""
+
+    def test_keeps_request_order(self, scraper):
+        """Each query gets its own product list, in request order"""
+        results = [{'hits': [{'productName': 'Milk'}]}, {'hits': []}, {'hits': [{'productName': 'Eggs'}]}]
+
+        batch = scraper._parse_batch(results, 3)
+
+        assert [[p['name'] for p in products] for products in batch] == [['Milk'], [], ['Eggs']]
+
+    def test_pads_missing_results(self, scraper):
+        """Queries without a result (or without hits) get an empty list"""
+        assert scraper._parse_batch([{}], 3) == [[], [], []]
@@ -4,22 +4,93 @@ API endpoint tests
 Tests for all REST API endpoints including auth, cart, search, lists, and recipes.
 """
 import pytest
+import asyncio
+import uuid
+import orjson
+from contextlib import contextmanager
+from types import MappingProxyType
+from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 
+from src import database
+from src.api import health, images
+from tests.conftest import FAILING_INGREDIENT
+
+# Built once at import; read-only so no test can leak changes into another
+TOO_MANY_PRODUCT_NAMES = tuple(f"Product{i}" for i in range(25))  # Image fetch max is 20
+MIN_CART_ITEM = MappingProxyType({"name": "Test", "price": "$1", "quantity": 1})
+ITEM_A = MappingProxyType({"name": "Item1", "price": "$1", "quantity": 1})
+ITEM_B = MappingProxyType({"name": "Item2", "price": "$2", "quantity": 1})
+
+# Pre-serialized bodies, sent with content= to skip per-request JSON encoding
+JSON_HEADERS = MappingProxyType({"content-type": "application/json"})
+MIN_CART_ITEM_JSON = orjson.dumps(dict(MIN_CART_ITEM))
+ITEM_A_JSON = orjson.dumps(dict(ITEM_A))
+ITEM_B_JSON = orjson.dumps(dict(ITEM_B))
+
+
+def post_concurrently(async_client, path, payloads):
+    """POST independent payloads to one endpoint concurrently, returning responses in order"""
+    async def run():
+        async with async_client() as ac:
+            return await asyncio.gather(*(ac.post(path, json=payload) for payload in payloads))
+
+    return asyncio.run(run())
+
+
+def recipes_by_id(client, **kwargs):
+    """The client's recipes from one GET /api/recipes, keyed by id"""
+    response = client.get("/api/recipes", **kwargs)
+    assert response.status_code == 200, response.text
+    recipes = response.json()["recipes"]
+    return {r["id"]: r for r in recipes}
+
+
+def get_recipe(client, recipe_id):
+    """One recipe (with items) from GET /api/recipes"""
+    return recipes_by_id(client)[recipe_id]
+
 
 class TestHealthEndpoint:
     """Test health check endpoint"""
 
-    def test_health_check(self, client):
+    def test_health_check(self, async_client):
         """Test /api/health returns 200"""
-        response = client.get("/api/health")
+        async def run_test():
+            async with async_client() as ac:
+                return await ac.get("/api/health")
+
+        response = asyncio.run(run_test())
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] in ["ok", "degraded"]  # "ok" when healthy
+        assert data["status"] in ("ok", "degraded")  # "ok" when healthy
         assert "database" in data
         assert "timestamp" in data
 
+    def test_health_check_reuses_recent_db_ping(self, client, monkeypatch):
+        """Health checks within the same second share one database ping"""
+        cursor = MagicMock()
+
+        @contextmanager
+        def fake_get_db():
+            yield cursor
+
+        monkeypatch.setattr(health, "get_db", fake_get_db)
+        monkeypatch.setattr(health, "monotonic", lambda: 1000.0)
+        health._db_status.cache_clear()
+
+        try:
+            first = client.get("/api/health").json()
+            second = client.get("/api/health").json()
+        finally:
+            health._db_status.cache_clear()
+
+        assert first["database"] == second["database"] == "ok"
+        cursor.execute.assert_called_once_with("SELECT 1")
+
 
+@pytest.mark.usefixtures("db_txn")
+@pytest.mark.xdist_group("cart")
 class TestCartEndpoints:
     """Test cart API endpoints"""
 
@@ -46,37 +117,44 @@ class TestCartEndpoints:
         assert data["success"] is True
         assert len(data["cart"]) >= 1
 
-    def test_update_cart_quantity(self, client):
+    def test_update_cart_quantity(self, client, cart_item):
         """Test PUT /api/cart/quantity"""
-        # First add an item
-        item = {"name": "Test", "price": "$1.00", "quantity": 1}
-        add_response = client.post("/api/cart/add", json=item)
-        cart_item_id = add_response.json()["cart"][0]["id"]
-
         # Update quantity
-        update_data = {"cart_item_id": cart_item_id, "quantity": 5}
+        update_data = {"cart_item_id": cart_item["id"], "quantity": 5}
         response = client.put("/api/cart/quantity", json=update_data)
 
         assert response.status_code == 200
         assert response.json()["success"] is True
 
-    def test_clear_cart(self, client):
+    def test_clear_cart(self, client, seed_cart):
         """Test DELETE /api/cart"""
         # Add some items
-        client.post("/api/cart/add", json={"name": "Item1", "price": "$1", "quantity": 1})
-        client.post("/api/cart/add", json={"name": "Item2", "price": "$2", "quantity": 1})
+        seed_cart([ITEM_A, ITEM_B])
 
         # Clear cart
         response = client.delete("/api/cart")
         assert response.status_code == 200
-        assert response.json()["success"] is True
-        assert response.json()["cart"] == []
+        data = response.json()
+        assert data["success"] is True
+        assert data["cart"] == []
 
+    def test_get_cart_with_many_items(self, client, seed_cart):
+        """Test GET /api/cart returns a large seeded cart (seeded via COPY)"""
+        items = [{"name": f"Bulk {i}", "price": "$1.25", "quantity": 1} for i in range(20)]
+        items[0]["aisle"] = "Dairy"
+        ids = seed_cart(items)
 
+        cart = client.get("/api/cart").json()["cart"]
+        assert sorted(item["id"] for item in cart) == ids
+        assert {item["product_name"]: item["aisle"] for item in cart}["Bulk 0"] == "Dairy"
+        assert len(cart) == 20
+
+
+@pytest.mark.usefixtures("fake_search")
 class TestSearchEndpoint:
-    """Test search API endpoint"""
+    """Test search API endpoint (Algolia stubbed with canned products)"""
 
-    def test_search_products(self, client):
+    def test_search_products(self, client, fake_search):
         """Test POST /api/search"""
         search_data = {"search_term": "bananas", "max_results": 5}
 
@@ -84,17 +162,18 @@ class TestSearchEndpoint:
         assert response.status_code == 200
         data = response.json()
 
-        assert "products" in data
-        assert isinstance(data["products"], list)
-        # Note: Actual results depend on Algolia API
+        assert data["products"] == fake_search[:5]
+        assert data["from_cache"] is False
+        assert data["total_found"] == len(fake_search)
 
     def test_search_empty_term_fails(self, client):
         """Test search with empty term returns validation error"""
         response = client.post("/api/search", json={"search_term": "", "max_results": 5})
-        # Should either return empty results or validation error
-        assert response.status_code in [200, 422]
+        assert response.status_code == 422
 
 
+@pytest.mark.usefixtures("db_txn")
+@pytest.mark.xdist_group("cart")
 class TestListEndpoints:
     """Test list API endpoints"""
 
@@ -106,11 +185,30 @@ class TestListEndpoints:
         assert "lists" in data
         assert isinstance(data["lists"], list)
 
-    def test_get_lists_with_saved_lists(self, client):
+    def test_get_lists_not_modified_with_etag(self, client):
+        """Test GET /api/lists returns 304 when If-None-Match matches the ETag"""
+        first = client.get("/api/lists")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = client.get("/api/lists", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+
+        # ETag changes once the lists change
+        client.post("/api/cart/add", content=MIN_CART_ITEM_JSON, headers=JSON_HEADERS)
+        client.post("/api/lists/save", json={"name": "ETag List"})
+        third = client.get("/api/lists", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
+    def test_get_lists_with_saved_lists(self, client, seed_cart):
         """Test GET /api/lists returns saved lists with details"""
         # Add items to cart
-        client.post("/api/cart/add", json={"name": "Milk", "price": "$3.99", "quantity": 1})
-        client.post("/api/cart/add", json={"name": "Bread", "price": "$2.49", "quantity": 2})
+        seed_cart([
+            {"name": "Milk", "price": "$3.99", "quantity": 1},
+            {"name": "Bread", "price": "$2.49", "quantity": 2}
+        ])
 
         # Save as list
         client.post("/api/lists/save", json={"name": "Grocery List"})
@@ -144,28 +242,19 @@ class TestListEndpoints:
         assert "list_id" in data
         assert isinstance(data["list_id"], int)
 
-    def test_save_list_empty_cart_fails(self, client):
-        """Test POST /api/lists/save with empty cart returns error"""
-        # Clear cart first
-        client.delete("/api/cart")
-
-        # Try to save empty cart
-        response = client.post("/api/lists/save", json={"name": "Empty List"})
-
-        assert response.status_code == 400
-        assert "Cart is empty" in response.json()["detail"]
-
-    def test_save_list_invalid_name_fails(self, client):
-        """Test POST /api/lists/save with missing name returns validation error"""
-        # Add item to cart
-        client.post("/api/cart/add", json={"name": "Test", "price": "$1", "quantity": 1})
-
-        # Try to save without name
-        response = client.post("/api/lists/save", json={})
+    @pytest.mark.parametrize("method,path,body,status,detail", [
+        ("post", "/api/lists/save", {"name": "Empty List"}, 400, "Cart is empty"),
+        ("post", "/api/lists/999999/load", None, 404, "List not found"),
+        ("delete", "/api/lists/999999", None, 404, "List not found"),
+    ], ids=["save_empty_cart", "load_invalid_id", "delete_invalid_id"])
+    def test_list_request_fails(self, client, method, path, body, status, detail):
+        """Test list requests against an empty cart or non-existent list return errors"""
+        response = client.request(method.upper(), path, json=body)
 
-        assert response.status_code == 422  # Pydantic validation error
+        assert response.status_code == status
+        assert detail in response.json()["detail"]
 
-    def test_load_list_success(self, client):
+    def test_load_list_success(self, client, clear_cart):
         """Test POST /api/lists/{list_id}/load loads list to cart"""
         # Create a list
         client.post("/api/cart/add", json={"name": "Orange Juice", "price": "$5.99", "quantity": 1})
@@ -173,7 +262,7 @@ class TestListEndpoints:
         list_id = save_response.json()["list_id"]
 
         # Clear cart
-        client.delete("/api/cart")
+        clear_cart()
 
         # Load list
         response = client.post(f"/api/lists/{list_id}/load")
@@ -185,14 +274,7 @@ class TestListEndpoints:
         assert len(data["cart"]) >= 1
         assert data["list_name"] == "Breakfast"
 
-    def test_load_list_invalid_id_fails(self, client):
-        """Test POST /api/lists/{list_id}/load with non-existent ID returns 404"""
-        response = client.post("/api/lists/999999/load")
-
-        assert response.status_code == 404
-        assert "List not found" in response.json()["detail"]
-
-    def test_load_list_replaces_cart_contents(self, client):
+    def test_load_list_replaces_cart_contents(self, client, async_client, clear_cart):
         """Test loading list clears existing cart contents"""
         # Create list 1
         client.post("/api/cart/add", json={"name": "Item A", "price": "$1", "quantity": 1})
@@ -200,9 +282,11 @@ class TestListEndpoints:
         list_id = save_response.json()["list_id"]
 
         # Add different items to cart
-        client.delete("/api/cart")
-        client.post("/api/cart/add", json={"name": "Item B", "price": "$2", "quantity": 1})
-        client.post("/api/cart/add", json={"name": "Item C", "price": "$3", "quantity": 1})
+        clear_cart()
+        post_concurrently(async_client, "/api/cart/add", [
+            {"name": "Item B", "price": "$2", "quantity": 1},
+            {"name": "Item C", "price": "$3", "quantity": 1}
+        ])
 
         # Load list 1
         response = client.post(f"/api/lists/{list_id}/load")
@@ -230,13 +314,6 @@ class TestListEndpoints:
         list_ids = [lst["id"] for lst in lists_response.json()["lists"]]
         assert list_id not in list_ids
 
-    def test_delete_list_invalid_id_fails(self, client):
-        """Test DELETE /api/lists/{list_id} with non-existent ID returns 404"""
-        response = client.delete("/api/lists/999999")
-
-        assert response.status_code == 404
-        assert "List not found" in response.json()["detail"]
-
     def test_delete_list_updates_frequent_items(self, client):
         """Test DELETE decrements frequent items purchase_count"""
         # Create list with items
@@ -254,7 +331,7 @@ class TestListEndpoints:
     def test_auto_save_list_creates_new(self, client):
         """Test POST /api/lists/auto-save creates new list"""
         # Add item to cart
-        client.post("/api/cart/add", json={"name": "Test", "price": "$1", "quantity": 1})
+        client.post("/api/cart/add", content=MIN_CART_ITEM_JSON, headers=JSON_HEADERS)
 
         # Auto-save
         list_data = {"name": "Monday, January 30, 2025"}
@@ -267,19 +344,14 @@ class TestListEndpoints:
         assert data["updated"] is False  # New list
 
     def test_auto_save_list_updates_existing_today(self, client):
-        """Test POST /api/lists/auto-save updates existing list from today
-
-        NOTE: This test is skipped due to a bug in src/api/lists.py line 139-143.
-        The code tries to update last_updated column which was removed in migration 009.
-        Fix: Remove lines 139-143 from src/api/lists.py (UPDATE last_updated query).
-        """
+        """Test POST /api/lists/auto-save updates existing list from today"""
         # Create first auto-save
-        client.post("/api/cart/add", json={"name": "Item 1", "price": "$1", "quantity": 1})
+        client.post("/api/cart/add", content=ITEM_A_JSON, headers=JSON_HEADERS)
         response1 = client.post("/api/lists/auto-save", json={"name": "Tuesday, January 31, 2025"})
         list_id = response1.json()["list_id"]
 
         # Modify cart
-        client.post("/api/cart/add", json={"name": "Item 2", "price": "$2", "quantity": 1})
+        client.post("/api/cart/add", content=ITEM_B_JSON, headers=JSON_HEADERS)
 
         # Auto-save again with same name
         response2 = client.post("/api/lists/auto-save", json={"name": "Tuesday, January 31, 2025"})
@@ -292,9 +364,6 @@ class TestListEndpoints:
 
     def test_auto_save_empty_cart_returns_message(self, client):
         """Test POST /api/lists/auto-save with empty cart returns success message"""
-        # Clear cart
-        client.delete("/api/cart")
-
         # Try auto-save
         response = client.post("/api/lists/auto-save", json={"name": "Wednesday, Feb 1, 2025"})
 
@@ -349,26 +418,33 @@ class TestListEndpoints:
         assert data["exists"] is False
         assert "list" not in data
 
-    def test_get_todays_list_excludes_old_auto_saved(self, client):
+    def test_get_todays_list_excludes_old_auto_saved(self, client, cart_item):
         """Test GET /api/lists/today only returns lists from current date"""
-        # Note: This test assumes we can't easily mock dates in the test
-        # It verifies the endpoint executes without checking date logic
+        list_id = client.post("/api/lists/auto-save", json={"name": "Yesterday's List"}).json()["list_id"]
+
+        # "Today" is the database's CURRENT_DATE, so age the row instead of the clock
+        with database.get_db() as cursor:
+            cursor.execute("""
+                UPDATE saved_lists SET created_at = created_at - INTERVAL '1 day'
+                WHERE id = %s
+            """, (list_id,))
 
         response = client.get("/api/lists/today")
 
         assert response.status_code == 200
-        assert "exists" in response.json()
+        assert response.json() == {"exists": False}
 
-    def test_multiple_lists_workflow(self, client):
+    @pytest.mark.slow  # Create/load/delete are each covered above; full flow is for full runs
+    def test_multiple_lists_workflow(self, client, seed_cart, clear_cart):
         """Test complete workflow: create, load, delete multiple lists"""
         # Create list 1
-        client.post("/api/cart/add", json={"name": "Coffee", "price": "$10", "quantity": 1})
+        seed_cart([{"name": "Coffee", "price": "$10", "quantity": 1}])
         list1_response = client.post("/api/lists/save", json={"name": "Drinks"})
         list1_id = list1_response.json()["list_id"]
 
         # Create list 2
-        client.delete("/api/cart")
-        client.post("/api/cart/add", json={"name": "Bread", "price": "$3", "quantity": 2})
+        clear_cart()
+        seed_cart([{"name": "Bread", "price": "$3", "quantity": 2}])
         list2_response = client.post("/api/lists/save", json={"name": "Bakery"})
         list2_id = list2_response.json()["list_id"]
 
@@ -379,7 +455,7 @@ class TestListEndpoints:
         assert list2_id in list_ids
 
         # Load list 1
-        client.delete("/api/cart")
+        clear_cart()
         load_response = client.post(f"/api/lists/{list1_id}/load")
         assert load_response.json()["cart"][0]["product_name"] == "Coffee"
 
@@ -394,37 +470,52 @@ class TestListEndpoints:
         assert list2_id not in final_ids
 
 
+@pytest.mark.usefixtures("fake_images")
 class TestImageEndpoints:
-    """Test image API endpoints"""
-
-    def test_fetch_images_batch(self, client):
-        """Test POST /api/images/fetch"""
-        request_data = {"product_names": ["Bananas", "Milk"]}
-
-        response = client.post("/api/images/fetch", json=request_data)
-        assert response.status_code == 200
-        data = response.json()
-
-        assert "results" in data
-        assert "success_count" in data
-        assert "total_count" in data
-        assert data["total_count"] == 2
-
-    def test_fetch_images_empty_list(self, client):
-        """Test batch fetch with empty list"""
-        response = client.post("/api/images/fetch", json={"product_names": []})
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total_count"] == 0
+    """Test image API endpoints (Algolia image lookups stubbed)"""
+
+    @pytest.mark.parametrize("product_names,expected_status,expected_count", [
+        (["Bananas", "Milk"], 200, 2),
+        ([], 200, 0),
+        (TOO_MANY_PRODUCT_NAMES, 400, None),
+    ], ids=["batch", "empty_list", "exceeds_limit"])
+    def test_fetch_images(self, async_client, product_names, expected_status, expected_count):
+        """Test POST /api/images/fetch (batch, empty list, too many items)"""
+        async def run_test():
+            async with async_client() as ac:
+                return await ac.post("/api/images/fetch", json={"product_names": product_names})
+
+        response = asyncio.run(run_test())
+        assert response.status_code == expected_status
+
+        if expected_count is not None:
+            data = response.json()
+            assert data["total_count"] == expected_count
+            assert data["success_count"] == expected_count
+            assert [r["product_name"] for r in data["results"]] == product_names
+            assert all(r["image_url"] for r in data["results"])
+
+    def test_fetch_images_runs_lookups_concurrently(self, client, monkeypatch):
+        """20 lookups overlap up to MAX_CONCURRENT_FETCHES at a time, in order"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_search(query, max_results=10, store_number=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{"name": query, "image": f"https://example.com/{query}.jpg"}]
+
+        monkeypatch.setattr(images.scraper, "search_products_async", slow_search)
+        product_names = [f"Product{i}" for i in range(20)]
 
-    def test_fetch_images_exceeds_limit(self, client):
-        """Test batch fetch with too many items"""
-        # Max is 20 items
-        product_names = [f"Product{i}" for i in range(25)]
         response = client.post("/api/images/fetch", json={"product_names": product_names})
 
-        # Should return 400 Bad Request
-        assert response.status_code == 400
+        assert response.status_code == 200
+        assert [r["product_name"] for r in response.json()["results"]] == product_names
+        assert 1 < peak <= images.MAX_CONCURRENT_FETCHES
 
 
 class TestCORSHeaders:
@@ -434,51 +525,81 @@ class TestCORSHeaders:
         """Test CORS headers are present (if in debug mode)"""
         response = client.options("/api/health")
         # CORS headers should be present or endpoint should return 405
-        assert response.status_code in [200, 405]
+        assert response.status_code in (200, 405)
 
 
 class TestErrorHandling:
     """Test API error handling"""
 
-    def test_invalid_endpoint_returns_404(self, client):
-        """Test accessing non-existent endpoint"""
-        response = client.get("/api/nonexistent")
-        assert response.status_code == 404
+    @pytest.mark.parametrize("method,path,status", [
+        ("get", "/api/nonexistent", 404),
+        ("get", "/api/cart/add", 405),  # GET on POST endpoint
+    ], ids=["unknown_endpoint", "wrong_method"])
+    def test_error_status(self, client, method, path, status):
+        """Test routing errors for unknown paths and wrong HTTP methods"""
+        response = client.request(method.upper(), path)
+        assert response.status_code == status
+
+    @pytest.mark.parametrize("method,path,body", [
+        ("post", "/api/cart/add", {"invalid": "data"}),  # Missing required fields
+        ("post", "/api/lists/save", {}),
+        ("post", "/api/recipes/create", {}),
+        ("post", "/api/recipes/save-cart", {}),
+        ("post", "/api/recipes/1/items", {"price": "$1.00"}),
+        ("put", "/api/recipes/items/1/quantity", {}),
+    ], ids=["cart_add", "save_list", "create_recipe", "save_cart_as_recipe", "add_recipe_item", "recipe_item_quantity"])
+    def test_invalid_body_returns_422(self, client, method, path, body):
+        """Test request bodies missing required fields fail validation before the handler runs"""
+        response = client.request(method.upper(), path, json=body)
+        assert response.status_code == 422  # Pydantic validation error
 
-    def test_invalid_method_returns_405(self, client):
-        """Test using wrong HTTP method"""
-        # GET on POST endpoint
-        response = client.get("/api/cart/add")
-        assert response.status_code == 405
-
-    def test_invalid_json_returns_422(self, client):
-        """Test sending invalid JSON"""
-        response = client.post(
-            "/api/cart/add",
-            json={"invalid": "data"}  # Missing required fields
-        )
+    def test_unknown_cart_field_returns_422(self, client):
+        """Test cart payloads with unexpected fields are rejected"""
+        response = client.post("/api/cart/add", json={**MIN_CART_ITEM, "discount": "50%"})
         assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "extra_forbidden"
+
+
+class TestReadOnlyEndpoints:
+    """Test independent read-only requests dispatched concurrently"""
+
+    def test_readonly_endpoints_concurrently(self, async_client):
+        """Health, CORS preflight, 404 and 405 responses under asyncio.gather"""
+        async def run_test():
+            async with async_client() as ac:
+                return await asyncio.gather(
+                    ac.get("/api/health"),
+                    ac.options("/api/health"),
+                    ac.get("/api/nonexistent"),
+                    ac.get("/api/cart/add")
+                )
+
+        health_response, preflight, not_found, wrong_method = asyncio.run(run_test())
+
+        assert health_response.status_code == 200
+        assert preflight.status_code in (200, 405)
+        assert not_found.status_code == 404
+        assert wrong_method.status_code == 405
 
 
 class TestRateLimiting:
     """Test rate limiting"""
 
-    def test_rate_limiting_configured(self):
+    def test_rate_limiting_configured(self, app_module):
         """Verify rate limiting is configured in production"""
-        from config.settings import settings
-        from app import app
+        state = app_module.state
 
         # Check that rate limiter exists
-        assert hasattr(app.state, 'limiter'), "Rate limiter not configured"
+        assert hasattr(state, 'limiter'), "Rate limiter not configured"
 
         # Check that setting exists
-        assert hasattr(settings, 'ENABLE_RATE_LIMITING'), "ENABLE_RATE_LIMITING setting missing"
-
         # In production (ENABLE_RATE_LIMITING=true), rate limiting should be active
         # In tests (ENABLE_RATE_LIMITING=false), it's disabled for test isolation
-        print(f"Rate limiting enabled: {settings.ENABLE_RATE_LIMITING}")
+        assert isinstance(state.settings.ENABLE_RATE_LIMITING, bool), "ENABLE_RATE_LIMITING setting missing"
 
 
+@pytest.mark.usefixtures("db_txn")
+@pytest.mark.xdist_group("recipes")
 class TestRecipeEndpoints:
     """Test recipe API endpoints"""
 
@@ -490,6 +611,23 @@ class TestRecipeEndpoints:
         assert "recipes" in data
         assert isinstance(data["recipes"], list)
 
+    def test_get_recipes_not_modified_with_etag(self, client):
+        """Test GET /api/recipes returns 304 until a recipe item changes"""
+        client.post("/api/recipes/create", json={"name": "ETag Recipe"})
+        recipe = client.get("/api/recipes")
+        recipe_id = recipe.json()["recipes"][0]["id"]
+        etag = recipe.headers["etag"]
+
+        second = client.get("/api/recipes", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+
+        # Item edits don't touch the recipe row but still change the ETag
+        client.post(f"/api/recipes/{recipe_id}/items", json={"name": "Salt", "price": "$0.99"})
+        third = client.get("/api/recipes", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
     def test_get_recipes_with_existing_recipes(self, client):
         """Test GET /api/recipes returns all user's recipes"""
         # Create a couple of recipes
@@ -530,16 +668,13 @@ class TestRecipeEndpoints:
         assert response.status_code == 200
         assert response.json()["success"] is True
 
-    def test_create_recipe_missing_name_fails(self, client):
-        """Test POST /api/recipes/create without name returns validation error"""
-        response = client.post("/api/recipes/create", json={})
-        assert response.status_code == 422  # Pydantic validation error
-
-    def test_save_cart_as_recipe_success(self, client):
+    def test_save_cart_as_recipe_success(self, client, seed_cart):
         """Test POST /api/recipes/save-cart creates recipe from current cart"""
         # Add items to cart
-        client.post("/api/cart/add", json={"name": "Chicken", "price": "$8.99", "quantity": 2})
-        client.post("/api/cart/add", json={"name": "Rice", "price": "$4.50", "quantity": 1})
+        seed_cart([
+            {"name": "Chicken", "price": "$8.99", "quantity": 2},
+            {"name": "Rice", "price": "$4.50", "quantity": 1}
+        ])
 
         # Save cart as recipe
         recipe_data = {"name": "Dinner Recipe", "description": "Weekly meal"}
@@ -558,29 +693,16 @@ class TestRecipeEndpoints:
 
     def test_save_cart_as_recipe_empty_cart_fails(self, client):
         """Test POST /api/recipes/save-cart with empty cart returns 400"""
-        # Clear cart
-        client.delete("/api/cart")
-
         # Try to save empty cart
         response = client.post("/api/recipes/save-cart", json={"name": "Empty Recipe"})
 
         assert response.status_code == 400
         assert "Cart is empty" in response.json()["detail"]
 
-    def test_save_cart_as_recipe_missing_name_fails(self, client):
-        """Test POST /api/recipes/save-cart without name returns validation error"""
-        # Add item to cart
-        client.post("/api/cart/add", json={"name": "Bread", "price": "$2.99", "quantity": 1})
-
-        # Try to save without name
-        response = client.post("/api/recipes/save-cart", json={})
-        assert response.status_code == 422
-
-    def test_add_item_to_recipe_success(self, client):
+    def test_add_item_to_recipe_success(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/items adds item to recipe"""
         # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Test Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
+        recipe_id, _ = seed_recipe("Test Recipe")
 
         # Add item
         item_data = {
@@ -595,19 +717,20 @@ class TestRecipeEndpoints:
         response = client.post(f"/api/recipes/{recipe_id}/items", json=item_data)
 
         assert response.status_code == 200
-        assert response.json()["success"] is True
+        data = response.json()
+        assert data["success"] is True
+        item_id = data["item_id"]
 
         # Verify item was added
-        recipes_response = client.get("/api/recipes")
-        recipe = next(r for r in recipes_response.json()["recipes"] if r["id"] == recipe_id)
+        recipe = get_recipe(client, recipe_id)
         assert len(recipe["items"]) == 1
+        assert recipe["items"][0]["id"] == item_id
         assert recipe["items"][0]["product_name"] == "Tomatoes"
 
-    def test_add_item_to_recipe_minimal_fields(self, client):
+    def test_add_item_to_recipe_minimal_fields(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/items with only required fields"""
         # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Minimal Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
+        recipe_id, _ = seed_recipe("Minimal Recipe")
 
         # Add item with minimal fields
         item_data = {"name": "Carrots", "price": "$1.99"}
@@ -616,11 +739,10 @@ class TestRecipeEndpoints:
         assert response.status_code == 200
         assert response.json()["success"] is True
 
-    def test_add_item_to_recipe_with_weight_item(self, client):
+    def test_add_item_to_recipe_with_weight_item(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/items with weight-based item"""
         # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Deli Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
+        recipe_id, _ = seed_recipe("Deli Recipe")
 
         # Add weight-based item
         item_data = {
@@ -643,28 +765,9 @@ class TestRecipeEndpoints:
         assert response.status_code == 404
         assert "Recipe not found" in response.json()["detail"]
 
-    def test_add_item_missing_required_fields_fails(self, client):
-        """Test POST /api/recipes/{recipe_id}/items without required fields returns 422"""
-        # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Try to add item without name
-        response = client.post(f"/api/recipes/{recipe_id}/items", json={"price": "$1.00"})
-        assert response.status_code == 422
-
-    def test_update_recipe_item_quantity_success(self, client):
+    def test_update_recipe_item_quantity_success(self, client, seed_recipe):
         """Test PUT /api/recipes/items/{item_id}/quantity updates quantity"""
-        # Create recipe with item via cart (to ensure we have item IDs)
-        client.post("/api/cart/add", json={"name": "Apples", "price": "$4.99", "quantity": 1})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Get item ID directly from database (since items don't include id in API response)
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s", (recipe_id,))
-            item_id = cursor.fetchone()["id"]
+        recipe_id, (item_id,) = seed_recipe("Test Recipe", [{"name": "Apples", "price": "$4.99"}])
 
         # Update quantity
         response = client.put(f"/api/recipes/items/{item_id}/quantity", json={"quantity": 5})
@@ -672,45 +775,23 @@ class TestRecipeEndpoints:
         assert response.json()["success"] is True
 
         # Verify quantity was updated
-        updated_recipes = client.get("/api/recipes")
-        updated_recipe = next(r for r in updated_recipes.json()["recipes"] if r["id"] == recipe_id)
+        updated_recipe = get_recipe(client, recipe_id)
         assert updated_recipe["items"][0]["quantity"] == 5
 
-    def test_update_recipe_item_quantity_decimal(self, client):
+    def test_update_recipe_item_quantity_decimal(self, client, seed_recipe):
         """Test PUT /api/recipes/items/{item_id}/quantity with decimal quantity"""
-        # Create recipe with item via cart
-        client.post("/api/cart/add", json={"name": "Cheese", "price": "$6.99"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Get item ID from database
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s", (recipe_id,))
-            item_id = cursor.fetchone()["id"]
+        _, (item_id,) = seed_recipe("Test", [{"name": "Cheese", "price": "$6.99"}])
 
         # Update to decimal quantity
         response = client.put(f"/api/recipes/items/{item_id}/quantity", json={"quantity": 0.75})
         assert response.status_code == 200
 
-    def test_update_recipe_item_quantity_missing_quantity_fails(self, client):
-        """Test PUT /api/recipes/items/{item_id}/quantity without quantity returns 422"""
-        response = client.put("/api/recipes/items/1/quantity", json={})
-        assert response.status_code == 422
-
-    def test_remove_item_from_recipe_success(self, client):
+    def test_remove_item_from_recipe_success(self, client, seed_recipe):
         """Test DELETE /api/recipes/items/{item_id} removes item"""
-        # Create recipe with items via cart
-        client.post("/api/cart/add", json={"name": "Item 1", "price": "$1.00"})
-        client.post("/api/cart/add", json={"name": "Item 2", "price": "$2.00"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Get first item ID from database
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s ORDER BY id LIMIT 1", (recipe_id,))
-            item_id = cursor.fetchone()["id"]
+        _, (item_id, _) = seed_recipe("Test Recipe", [
+            {"name": "Item 1", "price": "$1.00"},
+            {"name": "Item 2", "price": "$2.00"}
+        ])
 
         # Remove item
         response = client.delete(f"/api/recipes/items/{item_id}")
@@ -721,18 +802,9 @@ class TestRecipeEndpoints:
         updated_recipe = client.get("/api/recipes").json()["recipes"][0]
         assert len(updated_recipe["items"]) == 1
 
-    def test_remove_item_removes_last_item(self, client):
+    def test_remove_item_removes_last_item(self, client, seed_recipe):
         """Test DELETE /api/recipes/items/{item_id} can remove last item"""
-        # Create recipe with one item via cart
-        client.post("/api/cart/add", json={"name": "Only Item", "price": "$1.00"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Get item ID from database
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s", (recipe_id,))
-            item_id = cursor.fetchone()["id"]
+        _, (item_id,) = seed_recipe("Test", [{"name": "Only Item", "price": "$1.00"}])
 
         response = client.delete(f"/api/recipes/items/{item_id}")
         assert response.status_code == 200
@@ -741,52 +813,23 @@ class TestRecipeEndpoints:
         updated_recipe = client.get("/api/recipes").json()["recipes"][0]
         assert len(updated_recipe["items"]) == 0
 
-    def test_update_recipe_name_success(self, client):
-        """Test PUT /api/recipes/{recipe_id} updates recipe name"""
-        # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Old Name"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Update name
-        response = client.put(f"/api/recipes/{recipe_id}", json={"name": "New Name"})
+    @pytest.mark.parametrize("payload", [
+        {"name": "New Name"},
+        {"description": "New Description"},
+        {"name": "Updated Name", "description": "Updated Description"},
+        {},  # No fields still succeeds but changes nothing
+    ], ids=["name", "description", "both_fields", "no_fields"])
+    def test_update_recipe(self, client, seed_recipe, payload):
+        """Test PUT /api/recipes/{recipe_id} updates only the provided fields"""
+        recipe_id, _ = seed_recipe("Old Name", description="Old")
+
+        response = client.put(f"/api/recipes/{recipe_id}", json=payload)
         assert response.status_code == 200
         assert response.json()["success"] is True
 
-        # Verify name was updated
-        recipe = client.get("/api/recipes").json()["recipes"][0]
-        assert recipe["name"] == "New Name"
-
-    def test_update_recipe_description_success(self, client):
-        """Test PUT /api/recipes/{recipe_id} updates description"""
-        # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Test", "description": "Old"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Update description
-        response = client.put(f"/api/recipes/{recipe_id}", json={"description": "New Description"})
-        assert response.status_code == 200
-
-        # Verify description was updated
-        recipe = client.get("/api/recipes").json()["recipes"][0]
-        assert recipe["description"] == "New Description"
-
-    def test_update_recipe_both_fields(self, client):
-        """Test PUT /api/recipes/{recipe_id} updates both name and description"""
-        # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Old", "description": "Old"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Update both fields
-        response = client.put(
-            f"/api/recipes/{recipe_id}",
-            json={"name": "Updated Name", "description": "Updated Description"}
-        )
-        assert response.status_code == 200
-
-        # Verify both fields were updated
-        recipe = client.get("/api/recipes").json()["recipes"][0]
-        assert recipe["name"] == "Updated Name"
-        assert recipe["description"] == "Updated Description"
+        recipe = get_recipe(client, recipe_id)
+        expected = {"name": "Old Name", "description": "Old", **payload}
+        assert (recipe["name"], recipe["description"]) == (expected["name"], expected["description"])
 
     def test_update_recipe_nonexistent_fails(self, client):
         """Test PUT /api/recipes/{recipe_id} with invalid ID returns 404"""
@@ -794,21 +837,10 @@ class TestRecipeEndpoints:
         assert response.status_code == 404
         assert "Recipe not found" in response.json()["detail"]
 
-    def test_update_recipe_no_fields_provided(self, client):
-        """Test PUT /api/recipes/{recipe_id} with no fields still succeeds"""
-        # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Update with no fields (should succeed but not change anything)
-        response = client.put(f"/api/recipes/{recipe_id}", json={})
-        assert response.status_code == 200
-
-    def test_delete_recipe_success(self, client):
+    def test_delete_recipe_success(self, client, seed_recipe):
         """Test DELETE /api/recipes/{recipe_id} removes recipe"""
         # Create recipe
-        recipe_response = client.post("/api/recipes/create", json={"name": "To Delete"})
-        recipe_id = recipe_response.json()["recipe_id"]
+        recipe_id, _ = seed_recipe("To Delete")
 
         # Delete recipe
         response = client.delete(f"/api/recipes/{recipe_id}")
@@ -816,25 +848,21 @@ class TestRecipeEndpoints:
         assert response.json()["success"] is True
 
         # Verify recipe is gone
-        recipes = client.get("/api/recipes").json()["recipes"]
-        assert not any(r["id"] == recipe_id for r in recipes)
+        assert recipe_id not in recipes_by_id(client)
 
-    def test_delete_recipe_with_items(self, client):
+    def test_delete_recipe_with_items(self, client, seed_recipe):
         """Test DELETE /api/recipes/{recipe_id} removes recipe and all items"""
-        # Create recipe with items
-        recipe_response = client.post("/api/recipes/create", json={"name": "Recipe with Items"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        client.post(f"/api/recipes/{recipe_id}/items", json={"name": "Item 1", "price": "$1.00"})
-        client.post(f"/api/recipes/{recipe_id}/items", json={"name": "Item 2", "price": "$2.00"})
+        recipe_id, _ = seed_recipe("Recipe with Items", [
+            {"name": "Item 1", "price": "$1.00"},
+            {"name": "Item 2", "price": "$2.00"}
+        ])
 
         # Delete recipe
         response = client.delete(f"/api/recipes/{recipe_id}")
         assert response.status_code == 200
 
         # Verify recipe and items are gone
-        recipes = client.get("/api/recipes").json()["recipes"]
-        assert not any(r["id"] == recipe_id for r in recipes)
+        assert recipe_id not in recipes_by_id(client)
 
     def test_delete_recipe_does_not_affect_others(self, client):
         """Test DELETE /api/recipes/{recipe_id} only deletes specified recipe"""
@@ -849,20 +877,16 @@ class TestRecipeEndpoints:
         client.delete(f"/api/recipes/{recipe1_id}")
 
         # Verify recipe 2 still exists
-        recipes = client.get("/api/recipes").json()["recipes"]
-        assert any(r["id"] == recipe2_id for r in recipes)
-        assert not any(r["id"] == recipe1_id for r in recipes)
+        recipes = recipes_by_id(client)
+        assert recipe2_id in recipes
+        assert recipe1_id not in recipes
 
-    def test_load_recipe_to_cart_all_items(self, client):
+    def test_load_recipe_to_cart_all_items(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/add-to-cart loads all items"""
-        # Create recipe with items
-        client.post("/api/cart/add", json={"name": "Pasta", "price": "$2.99", "quantity": 2})
-        client.post("/api/cart/add", json={"name": "Sauce", "price": "$3.49", "quantity": 1})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Pasta Night"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Clear cart
-        client.delete("/api/cart")
+        recipe_id, _ = seed_recipe("Pasta Night", [
+            {"name": "Pasta", "price": "$2.99", "quantity": 2},
+            {"name": "Sauce", "price": "$3.49", "quantity": 1}
+        ])
 
         # Load recipe (all items)
         response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={})
@@ -872,27 +896,16 @@ class TestRecipeEndpoints:
         assert "cart" in data
         assert len(data["cart"]) == 2
 
-    def test_load_recipe_to_cart_selective_items(self, client):
+    def test_load_recipe_to_cart_selective_items(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/add-to-cart with item_ids"""
-        # Create recipe with multiple items via cart
-        client.post("/api/cart/add", json={"name": "Item A", "price": "$1.00"})
-        client.post("/api/cart/add", json={"name": "Item B", "price": "$2.00"})
-        client.post("/api/cart/add", json={"name": "Item C", "price": "$3.00"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Big Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Get item IDs from database (select first and third)
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s ORDER BY id", (recipe_id,))
-            all_items = cursor.fetchall()
-            item_ids = [all_items[0]["id"], all_items[2]["id"]]
-
-        # Clear cart
-        client.delete("/api/cart")
-
-        # Load only selected items
-        response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={"item_ids": item_ids})
+        recipe_id, (item_a, _, item_c) = seed_recipe("Big Recipe", [
+            {"name": "Item A", "price": "$1.00"},
+            {"name": "Item B", "price": "$2.00"},
+            {"name": "Item C", "price": "$3.00"}
+        ])
+
+        # Load only first and third items
+        response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={"item_ids": [item_a, item_c]})
         assert response.status_code == 200
         cart = response.json()["cart"]
         assert len(cart) == 2
@@ -901,16 +914,12 @@ class TestRecipeEndpoints:
         assert "Item C" in cart_names
         assert "Item B" not in cart_names
 
-    def test_load_recipe_to_cart_adds_to_existing(self, client):
+    def test_load_recipe_to_cart_adds_to_existing(self, client, seed_recipe, seed_cart):
         """Test POST /api/recipes/{recipe_id}/add-to-cart adds to existing cart"""
-        # Create recipe
-        client.post("/api/cart/add", json={"name": "Recipe Item", "price": "$5.00"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
+        recipe_id, _ = seed_recipe("Test", [{"name": "Recipe Item", "price": "$5.00"}])
 
         # Add different items to cart
-        client.delete("/api/cart")
-        client.post("/api/cart/add", json={"name": "Different Item", "price": "$10.00"})
+        seed_cart([{"name": "Different Item", "price": "$10.00"}])
 
         # Load recipe (should add to cart, not replace)
         response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={})
@@ -926,15 +935,9 @@ class TestRecipeEndpoints:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-    def test_load_recipe_with_invalid_item_ids_succeeds_empty(self, client):
+    def test_load_recipe_with_invalid_item_ids_succeeds_empty(self, client, seed_recipe):
         """Test POST /api/recipes/{recipe_id}/add-to-cart with non-existent item IDs succeeds but adds nothing"""
-        # Create recipe with one item via cart
-        client.post("/api/cart/add", json={"name": "Item", "price": "$1.00"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Test"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # Clear cart
-        client.delete("/api/cart")
+        recipe_id, _ = seed_recipe("Test", [{"name": "Item", "price": "$1.00"}])
 
         # Try to load with invalid item IDs (SQL will find no matching items, but succeeds)
         response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={"item_ids": [999999]})
@@ -942,66 +945,72 @@ class TestRecipeEndpoints:
         cart = response.json()["cart"]
         assert len(cart) == 0  # No items added
 
-    def test_recipe_workflow_complete(self, client):
+    def test_recipe_workflow_complete(self, client, async_client, clear_cart):
         """Test complete recipe workflow: create, add items, update, load, delete"""
-        # 1. Create recipe via cart
-        client.post("/api/cart/add", json={"name": "Flour", "price": "$3.99"})
-        client.post("/api/cart/add", json={"name": "Sugar", "price": "$4.49"})
-        recipe_response = client.post("/api/recipes/save-cart", json={"name": "Workflow Recipe"})
-        recipe_id = recipe_response.json()["recipe_id"]
-
-        # 2. Update recipe metadata
-        client.put(f"/api/recipes/{recipe_id}", json={"description": "Baking essentials"})
-
-        # 3. Update item quantity
-        from src.database import get_db
-        with get_db() as cursor:
-            cursor.execute("SELECT id FROM recipe_items WHERE recipe_id = %s ORDER BY id LIMIT 1", (recipe_id,))
-            item_id = cursor.fetchone()["id"]
-        client.put(f"/api/recipes/items/{item_id}/quantity", json={"quantity": 3})
-
-        # 4. Load to cart (clear first to verify load works)
-        client.delete("/api/cart")
-        load_response = client.post(f"/api/recipes/{recipe_id}/add-to-cart", json={})
-        assert load_response.status_code == 200
-        assert len(load_response.json()["cart"]) == 2
+        async def run_workflow():
+            async with async_client() as ac:
+                # 1. Create recipe via cart
+                await asyncio.gather(
+                    ac.post("/api/cart/add", json={"name": "Flour", "price": "$3.99"}),
+                    ac.post("/api/cart/add", json={"name": "Sugar", "price": "$4.49"})
+                )
+                recipe_response = await ac.post("/api/recipes/save-cart", json={"name": "Workflow Recipe"})
+                recipe_id = recipe_response.json()["recipe_id"]
+
+                # 2. Update recipe metadata while reading its items
+                update_response, items_response = await asyncio.gather(
+                    ac.put(f"/api/recipes/{recipe_id}", json={"description": "Baking essentials"}),
+                    ac.get(f"/api/recipes/{recipe_id}/items")
+                )
+                assert update_response.status_code == 200
+
+                # 3. Update item quantity
+                item_id = items_response.json()["items"][0]["id"]
+                quantity_response = await ac.put(f"/api/recipes/items/{item_id}/quantity", json={"quantity": 3})
+                assert quantity_response.status_code == 200
+
+                # 4. Load to cart (clear first to verify load works)
+                clear_cart()
+                load_response = await ac.post(f"/api/recipes/{recipe_id}/add-to-cart", json={})
+
+                # 5. Delete recipe
+                delete_response = await ac.delete(f"/api/recipes/{recipe_id}")
+                return recipe_id, load_response, delete_response
+
+        recipe_id, load_response, delete_response = asyncio.run(run_workflow())
 
-        # 5. Delete recipe
-        delete_response = client.delete(f"/api/recipes/{recipe_id}")
+        assert load_response.status_code == 200
+        cart = load_response.json()["cart"]
+        assert sorted(item["quantity"] for item in cart) == [1, 3]
         assert delete_response.status_code == 200
 
         # Verify recipe is gone
-        recipes = client.get("/api/recipes").json()["recipes"]
-        assert not any(r["id"] == recipe_id for r in recipes)
+        assert recipe_id not in recipes_by_id(client)
 
     def test_multiple_users_recipes_isolation(self, client):
         """Test that recipes are isolated per user"""
         # User 1 creates recipe
-        client.post("/api/recipes/create", json={"name": "User 1 Recipe"})
-
-        # Create new client with different user ID (simulates different user)
-        import uuid
-        from fastapi.testclient import TestClient
-        from app import app
+        user1_recipe_id = client.post("/api/recipes/create", json={"name": "User 1 Recipe"}).json()["recipe_id"]
 
-        with TestClient(app) as client2:
-            client2.headers = {"X-Anonymous-User-ID": str(uuid.uuid4())}
+        # Switch to a different user ID on the shared client (simulates different user)
+        user2_headers = {"X-Anonymous-User-ID": str(uuid.uuid4())}
 
-            # User 2 should not see User 1's recipe
-            response = client2.get("/api/recipes")
-            recipes = response.json()["recipes"]
-            assert not any(r["name"] == "User 1 Recipe" for r in recipes)
+        # User 2 should not see User 1's recipe
+        assert user1_recipe_id not in recipes_by_id(client, headers=user2_headers)
 
-            # User 2 creates their own recipe
-            client2.post("/api/recipes/create", json={"name": "User 2 Recipe"})
+        # User 2 creates their own recipe
+        user2_recipe_id = client.post(
+            "/api/recipes/create", json={"name": "User 2 Recipe"}, headers=user2_headers
+        ).json()["recipe_id"]
 
         # User 1 should not see User 2's recipe
-        recipes = client.get("/api/recipes").json()["recipes"]
-        assert not any(r["name"] == "User 2 Recipe" for r in recipes)
+        assert user2_recipe_id not in recipes_by_id(client)
 
 
+@pytest.mark.usefixtures("db_txn", "fake_import_search")
+@pytest.mark.xdist_group("recipes")
 class TestRecipeImportEndpoints:
-    """Test recipe import and parser API endpoints"""
+    """Test recipe import and parser API endpoints (Algolia stubbed with canned products)"""
 
     def test_parse_recipe_simple(self, client):
         """Test POST /api/recipes/parse with simple text"""
@@ -1093,26 +1102,45 @@ Toppings:
         data = response.json()
         assert data['success'] is True
         assert data['total_ingredients'] == 3
-        assert len(data['results']) == 3
+        assert [r['ingredient'] for r in data['results']] == ['olive oil', 'chicken', 'onion']
 
-        # Each result should have matches (or empty list if store doesn't have items)
+        # Matches are capped at max_results_per_item
         for result in data['results']:
-            assert 'ingredient' in result
-            assert 'matches' in result
-            assert 'match_count' in result
-            assert isinstance(result['matches'], list)
+            assert result['match_count'] == 3
+            assert [m['name'] for m in result['matches']] == [
+                f"Wegmans {result['ingredient'].title()} {i}" for i in range(3)
+            ]
 
-    def test_import_search_with_store_number(self, client):
+    def test_import_search_with_store_number(self, client, fake_import_search):
         """Test that store_number parameter is respected"""
         response = client.post('/api/recipes/import-search', json={
             'ingredients': ['chicken'],
             'max_results_per_item': 3,
-            'store_number': 86
+            'store_number': 101
         })
 
         assert response.status_code == 200
         data = response.json()
         assert data['success'] is True
+        assert fake_import_search == [(['chicken'], 3, 101)]
+
+    def test_import_search_isolates_failed_ingredient(self, client, fake_import_search):
+        """Test that one failing ingredient doesn't fail the others"""
+        response = client.post('/api/recipes/import-search', json={
+            'ingredients': ['olive oil', FAILING_INGREDIENT, 'onion'],
+            'max_results_per_item': 3,
+            'store_number': 86
+        })
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [r['ingredient'] for r in results] == ['olive oil', FAILING_INGREDIENT, 'onion']
+        assert [r['match_count'] for r in results] == [3, 0, 3]
+        assert results[1]['matches'] == []
+        assert FAILING_INGREDIENT in results[1]['error']
+        assert 'error' not in results[0] and 'error' not in results[2]
+        # The batch request was tried once before falling back
+        assert len(fake_import_search) == 1
 
     def test_import_search_empty_ingredients(self, client):
         """Test with empty ingredient list"""
@@ -1174,24 +1202,28 @@ Toppings:
 
         assert response.status_code == 404
 
-    def test_parse_then_search_flow(self, client):
-        """Test complete import flow: parse → search"""
-        # Step 1: Parse recipe
-        parse_response = client.post('/api/recipes/parse', json={
-            'text': '2 tablespoons olive oil\n1 pound chicken\n1 onion, chopped'
-        })
-
-        assert parse_response.status_code == 200
-        parse_data = parse_response.json()
-        ingredient_names = [ing['name'] for ing in parse_data['ingredients']]
-
-        # Step 2: Search for ingredients
-        search_response = client.post('/api/recipes/import-search', json={
-            'ingredients': ingredient_names,
-            'max_results_per_item': 3,
-            'store_number': 86
-        })
+    def test_parse_then_search_flow(self, async_client):
+        """Test complete import flow: parse → search (one client for both steps)"""
+        async def run_flow():
+            async with async_client() as ac:
+                # Step 1: Parse recipe
+                parse_response = await ac.post('/api/recipes/parse', json={
+                    'text': '2 tablespoons olive oil\n1 pound chicken\n1 onion, chopped'
+                })
+                assert parse_response.status_code == 200
+                ingredient_names = [ing['name'] for ing in parse_response.json()['ingredients']]
+
+                # Step 2: Search for ingredients
+                search_response = await ac.post('/api/recipes/import-search', json={
+                    'ingredients': ingredient_names,
+                    'max_results_per_item': 3,
+                    'store_number': 86
+                })
+                return ingredient_names, search_response
+
+        ingredient_names, search_response = asyncio.run(run_flow())
 
         assert search_response.status_code == 200
         search_data = search_response.json()
         assert len(search_data['results']) == len(ingredient_names)
+        assert all(result['match_count'] == 3 for result in search_data['results'])
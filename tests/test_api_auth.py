@@ -18,35 +18,127 @@ Achieves >90% coverage by testing:
 - Service unavailability
 - Data migration scenarios
 """
+import asyncio
+import time
+import jwt
+import orjson
 import pytest
-from unittest.mock import MagicMock, patch
-from fastapi.testclient import TestClient
-from app import app
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
+from typing import Optional
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, MagicMock
 from src.auth import AuthUser
-import uuid
+import src.auth
+import src.api.auth
+from src.api.auth import (
+    SignUpRequest, SignInRequest, PasswordResetRequest, PasswordUpdateRequest
+)
+import itertools
+
+
+# === Fake IDs ===
+
+_uuid_counter = itertools.count(1)
+
+
+def _fake_uuid() -> str:
+    """Unique UUID-shaped id for mocked Supabase users (no urandom call)"""
+    return f"00000000-0000-0000-0000-{next(_uuid_counter):012x}"
 
 
 # === Mock Supabase Response Classes ===
 
+@dataclass(frozen=True, slots=True)
 class MockSupabaseUser:
     """Mock Supabase user object"""
-    def __init__(self, user_id: str, email: str):
-        self.id = user_id
-        self.email = email
+    id: str
+    email: str
 
 
+@dataclass(frozen=True, slots=True)
 class MockSupabaseSession:
     """Mock Supabase session object"""
-    def __init__(self, access_token: str, refresh_token: str):
-        self.access_token = access_token
-        self.refresh_token = refresh_token
+    access_token: str
+    refresh_token: str
 
 
+@dataclass(frozen=True, slots=True)
 class MockAuthResponse:
     """Mock Supabase auth response"""
-    def __init__(self, user=None, session=None):
-        self.user = user
-        self.session = session
+    user: Optional[MockSupabaseUser] = None
+    session: Optional[MockSupabaseSession] = None
+
+
+# === Shared Test Data ===
+
+TEST_EMAIL = "test@example.com"
+TEST_PASSWORD = "SecurePass123!"
+TEST_ACCESS_TOKEN = "access-token-123"
+TEST_REFRESH_TOKEN = "refresh-token-456"
+
+# Session for tests that don't care which tokens come back (frozen, so shareable)
+DEFAULT_SESSION = MockSupabaseSession(TEST_ACCESS_TOKEN, TEST_REFRESH_TOKEN)
+
+# Pre-serialized bodies for recurring payloads, sent with content= to skip
+# per-request JSON encoding
+JSON_HEADERS = MappingProxyType({"content-type": "application/json"})
+CREDENTIALS_JSON = orjson.dumps({"email": TEST_EMAIL, "password": TEST_PASSWORD})
+EMAIL_JSON = orjson.dumps({"email": TEST_EMAIL})
+
+
+# === Fixtures ===
+
+_SUPABASE_AUTH_METHODS = ("sign_up", "sign_in_with_password", "sign_out",
+                          "reset_password_email", "update_user", "get_user")
+
+
+class _Call:
+    """Recording callable for a Supabase auth method (set return_value or side_effect)"""
+    __slots__ = ("return_value", "side_effect", "calls")
+
+    def __init__(self):
+        self.return_value = None
+        self.side_effect = None
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+
+@pytest.fixture
+def mock_supabase(monkeypatch):
+    """Stand-in Supabase client for both the auth endpoints and token checks"""
+    mock = SimpleNamespace(auth=SimpleNamespace(**{m: _Call() for m in _SUPABASE_AUTH_METHODS}))
+    monkeypatch.setattr(src.auth, "supabase", mock)
+    monkeypatch.setattr(src.api.auth, "supabase", mock)
+    return mock
+
+
+@pytest.fixture
+def no_supabase(monkeypatch):
+    """Auth endpoints see no configured Supabase client"""
+    monkeypatch.setattr(src.api.auth, "supabase", None)
+
+
+@pytest.fixture
+def mock_auth_db(monkeypatch):
+    """get_db for the auth endpoints, yielding a MagicMock cursor"""
+    mock_get_db = MagicMock()
+    mock_get_db.return_value.__enter__.return_value = MagicMock()
+    monkeypatch.setattr(src.api.auth, "get_db", mock_get_db)
+    return mock_get_db
+
+
+@pytest.fixture
+def mock_migrate(monkeypatch):
+    """Stand-in for the async migrate_anonymous_data (records calls)"""
+    mock = AsyncMock()
+    monkeypatch.setattr(src.api.auth, "migrate_anonymous_data", mock)
+    return mock
 
 
 # === Configuration Endpoint Tests ===
@@ -82,12 +174,11 @@ class TestAuthMeEndpoint:
         assert data["email"] is None
         assert "user_id" in data
 
-    @patch('src.auth.supabase')
     def test_auth_me_with_valid_token_returns_user(self, mock_supabase, client):
         """Test /api/auth/me with valid JWT returns authenticated user"""
         # Mock Supabase response
-        user_id = str(uuid.uuid4())
-        mock_user = MockSupabaseUser(user_id, "test@example.com")
+        user_id = _fake_uuid()
+        mock_user = MockSupabaseUser(user_id, TEST_EMAIL)
         mock_supabase.auth.get_user.return_value = MockAuthResponse(user=mock_user)
 
         # Make request with Bearer token
@@ -99,9 +190,30 @@ class TestAuthMeEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert data["is_anonymous"] is False
-        assert data["email"] == "test@example.com"
+        assert data["email"] == TEST_EMAIL
         assert data["user_id"] == user_id
 
+    def test_auth_me_caches_verified_token(self, mock_supabase, client, monkeypatch):
+        """Test a token with a future exp is verified with Supabase only once"""
+        monkeypatch.setattr(src.auth, "_token_cache", {})
+        user_id = _fake_uuid()
+        mock_supabase.auth.get_user.return_value = MockAuthResponse(
+            user=MockSupabaseUser(user_id, TEST_EMAIL)
+        )
+        # Only exp is read locally (signature is Supabase's job), so any key works
+        token = jwt.encode(
+            {"sub": user_id, "exp": int(time.time()) + 3600},
+            "test-signing-key-for-unverified-decode",
+            algorithm="HS256"
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first = client.get("/api/auth/me", headers=headers)
+        second = client.get("/api/auth/me", headers=headers)
+
+        assert first.json()["user_id"] == second.json()["user_id"] == user_id
+        assert mock_supabase.auth.get_user.calls == [((token,), {})]
+
     def test_auth_me_with_invalid_token_returns_401(self, client):
         """Test /api/auth/me with invalid token returns 401"""
         fake_token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.fake.signature"
@@ -119,47 +231,40 @@ class TestAuthMeEndpoint:
 class TestSignupEndpoint:
     """Test POST /api/auth/signup"""
 
-    @patch('src.api.auth.supabase')
-    @patch('src.api.auth.get_db')
-    def test_signup_success_with_session(self, mock_get_db, mock_supabase, client):
+    @pytest.mark.usefixtures("mock_auth_db")
+    def test_signup_success_with_session(self, mock_supabase, client):
         """Test successful signup that returns session immediately"""
-        user_id = str(uuid.uuid4())
+        user_id = _fake_uuid()
         email = "newuser@example.com"
 
-        # Mock database cursor
-        mock_cursor = MagicMock()
-        mock_get_db.return_value.__enter__.return_value = mock_cursor
-
         # Mock Supabase response (email confirmation disabled)
         mock_user = MockSupabaseUser(user_id, email)
-        mock_session = MockSupabaseSession("access-token-123", "refresh-token-456")
         mock_supabase.auth.sign_up.return_value = MockAuthResponse(
             user=mock_user,
-            session=mock_session
+            session=DEFAULT_SESSION
         )
 
         response = client.post("/api/auth/signup", json={
             "email": email,
-            "password": "SecurePass123!"
+            "password": TEST_PASSWORD
         })
 
         assert response.status_code == 200
         data = response.json()
         assert data["user_id"] == user_id
         assert data["email"] == email
-        assert data["access_token"] == "access-token-123"
-        assert data["refresh_token"] == "refresh-token-456"
+        assert data["access_token"] == TEST_ACCESS_TOKEN
+        assert data["refresh_token"] == TEST_REFRESH_TOKEN
 
         # Verify Supabase was called correctly
-        mock_supabase.auth.sign_up.assert_called_once_with({
+        assert mock_supabase.auth.sign_up.calls == [(({
             "email": email,
-            "password": "SecurePass123!"
-        })
+            "password": TEST_PASSWORD
+        },), {})]
 
-    @patch('src.api.auth.supabase')
     def test_signup_success_without_session_requires_confirmation(self, mock_supabase, client):
         """Test signup that requires email confirmation (no session)"""
-        user_id = str(uuid.uuid4())
+        user_id = _fake_uuid()
         email = "needsconfirm@example.com"
 
         # Mock Supabase response (email confirmation required)
@@ -171,7 +276,7 @@ class TestSignupEndpoint:
 
         response = client.post("/api/auth/signup", json={
             "email": email,
-            "password": "SecurePass123!"
+            "password": TEST_PASSWORD
         })
 
         assert response.status_code == 200
@@ -181,30 +286,23 @@ class TestSignupEndpoint:
         assert data["access_token"] == ""
         assert data["refresh_token"] == ""
 
-    @patch('src.api.auth.supabase')
-    @patch('src.api.auth.migrate_anonymous_data')
-    @patch('src.api.auth.get_db')
-    def test_signup_with_anonymous_migration(self, mock_get_db, mock_migrate, mock_supabase, client):
+    @pytest.mark.usefixtures("mock_auth_db")
+    def test_signup_with_anonymous_migration(self, mock_migrate, mock_supabase, client):
         """Test signup with anonymous_user_id triggers data migration"""
-        user_id = str(uuid.uuid4())
-        anonymous_id = str(uuid.uuid4())
+        user_id = _fake_uuid()
+        anonymous_id = _fake_uuid()
         email = "migrate@example.com"
 
-        # Mock database cursor
-        mock_cursor = MagicMock()
-        mock_get_db.return_value.__enter__.return_value = mock_cursor
-
         # Mock Supabase response
         mock_user = MockSupabaseUser(user_id, email)
-        mock_session = MockSupabaseSession("token", "refresh")
         mock_supabase.auth.sign_up.return_value = MockAuthResponse(
             user=mock_user,
-            session=mock_session
+            session=DEFAULT_SESSION
         )
 
         response = client.post("/api/auth/signup", json={
             "email": email,
-            "password": "SecurePass123!",
+            "password": TEST_PASSWORD,
             "anonymous_user_id": anonymous_id
         })
 
@@ -213,49 +311,16 @@ class TestSignupEndpoint:
         # Verify migration was called
         mock_migrate.assert_called_once()
 
-    @patch('src.api.auth.supabase')
     def test_signup_fails_when_user_not_created(self, mock_supabase, client):
         """Test signup returns 400 when Supabase doesn't return user"""
         # Mock Supabase response with no user
         mock_supabase.auth.sign_up.return_value = MockAuthResponse(user=None)
 
-        response = client.post("/api/auth/signup", json={
-            "email": "test@example.com",
-            "password": "password123"
-        })
+        response = client.post("/api/auth/signup", content=CREDENTIALS_JSON, headers=JSON_HEADERS)
 
         assert response.status_code == 400
         assert "Sign up failed" in response.json()["detail"]
 
-    @patch('src.api.auth.supabase', None)
-    def test_signup_fails_when_supabase_unavailable(self, client):
-        """Test signup returns 503 when Supabase client unavailable"""
-        response = client.post("/api/auth/signup", json={
-            "email": "test@example.com",
-            "password": "password123"
-        })
-
-        assert response.status_code == 503
-        assert "unavailable" in response.json()["detail"].lower()
-
-    def test_signup_validation_invalid_email(self, client):
-        """Test signup validation rejects invalid email"""
-        response = client.post("/api/auth/signup", json={
-            "email": "not-an-email",
-            "password": "password123"
-        })
-
-        assert response.status_code == 422  # Pydantic validation error
-
-    def test_signup_validation_missing_password(self, client):
-        """Test signup validation requires password"""
-        response = client.post("/api/auth/signup", json={
-            "email": "test@example.com"
-        })
-
-        assert response.status_code == 422
-
-    @patch('src.api.auth.supabase')
     def test_signup_handles_supabase_exception(self, mock_supabase, client):
         """Test signup handles Supabase API exceptions gracefully"""
         # Mock Supabase to raise exception
@@ -263,7 +328,7 @@ class TestSignupEndpoint:
 
         response = client.post("/api/auth/signup", json={
             "email": "existing@example.com",
-            "password": "password123"
+            "password": TEST_PASSWORD
         })
 
         assert response.status_code == 400
@@ -275,38 +340,31 @@ class TestSignupEndpoint:
 class TestSigninEndpoint:
     """Test POST /api/auth/signin"""
 
-    @patch('src.api.auth.supabase')
-    @patch('src.database.get_db')
-    def test_signin_success(self, mock_get_db, mock_supabase, client):
+    @pytest.mark.usefixtures("mock_auth_db")
+    def test_signin_success(self, mock_supabase, client):
         """Test successful signin with valid credentials"""
-        user_id = str(uuid.uuid4())
+        user_id = _fake_uuid()
         email = "user@example.com"
 
-        # Mock database cursor
-        mock_cursor = MagicMock()
-        mock_get_db.return_value.__enter__.return_value = mock_cursor
-
         # Mock Supabase response
         mock_user = MockSupabaseUser(user_id, email)
-        mock_session = MockSupabaseSession("access-token", "refresh-token")
         mock_supabase.auth.sign_in_with_password.return_value = MockAuthResponse(
             user=mock_user,
-            session=mock_session
+            session=DEFAULT_SESSION
         )
 
         response = client.post("/api/auth/signin", json={
             "email": email,
-            "password": "MyPassword123"
+            "password": TEST_PASSWORD
         })
 
         assert response.status_code == 200
         data = response.json()
         assert data["user_id"] == user_id
         assert data["email"] == email
-        assert data["access_token"] == "access-token"
-        assert data["refresh_token"] == "refresh-token"
+        assert data["access_token"] == TEST_ACCESS_TOKEN
+        assert data["refresh_token"] == TEST_REFRESH_TOKEN
 
-    @patch('src.api.auth.supabase')
     def test_signin_invalid_credentials(self, mock_supabase, client):
         """Test signin with invalid credentials returns 401"""
         # Mock Supabase response with no user/session
@@ -323,35 +381,6 @@ class TestSigninEndpoint:
         assert response.status_code == 401
         assert "Invalid credentials" in response.json()["detail"]
 
-    @patch('src.api.auth.supabase', None)
-    def test_signin_fails_when_supabase_unavailable(self, client):
-        """Test signin returns 503 when Supabase unavailable"""
-        response = client.post("/api/auth/signin", json={
-            "email": "test@example.com",
-            "password": "password123"
-        })
-
-        assert response.status_code == 503
-        assert "unavailable" in response.json()["detail"].lower()
-
-    def test_signin_validation_invalid_email(self, client):
-        """Test signin validation rejects invalid email"""
-        response = client.post("/api/auth/signin", json={
-            "email": "not-an-email",
-            "password": "password123"
-        })
-
-        assert response.status_code == 422
-
-    def test_signin_validation_missing_password(self, client):
-        """Test signin validation requires password"""
-        response = client.post("/api/auth/signin", json={
-            "email": "test@example.com"
-        })
-
-        assert response.status_code == 422
-
-    @patch('src.api.auth.supabase')
     def test_signin_handles_supabase_exception(self, mock_supabase, client):
         """Test signin handles Supabase exceptions gracefully"""
         mock_supabase.auth.sign_in_with_password.side_effect = Exception(
@@ -359,7 +388,7 @@ class TestSigninEndpoint:
         )
 
         response = client.post("/api/auth/signin", json={
-            "email": "test@example.com",
+            "email": TEST_EMAIL,
             "password": "wrongpass"
         })
 
@@ -372,24 +401,14 @@ class TestSigninEndpoint:
 class TestSignoutEndpoint:
     """Test POST /api/auth/signout"""
 
-    @patch('src.api.auth.supabase')
     def test_signout_success(self, mock_supabase, client):
         """Test successful signout"""
         response = client.post("/api/auth/signout")
 
         assert response.status_code == 200
         assert "Signed out" in response.json()["message"]
-        mock_supabase.auth.sign_out.assert_called_once()
+        assert len(mock_supabase.auth.sign_out.calls) == 1
 
-    @patch('src.api.auth.supabase', None)
-    def test_signout_fails_when_supabase_unavailable(self, client):
-        """Test signout returns 503 when Supabase unavailable"""
-        response = client.post("/api/auth/signout")
-
-        # Supabase check happens inside try-except, returns 400
-        assert response.status_code in [400, 503]
-
-    @patch('src.api.auth.supabase')
     def test_signout_handles_exception(self, mock_supabase, client):
         """Test signout handles Supabase exceptions"""
         mock_supabase.auth.sign_out.side_effect = Exception("Sign out failed")
@@ -404,7 +423,6 @@ class TestSignoutEndpoint:
 class TestForgotPasswordEndpoint:
     """Test POST /api/auth/forgot-password"""
 
-    @patch('src.api.auth.supabase')
     def test_forgot_password_success(self, mock_supabase, client):
         """Test forgot password sends reset email"""
         response = client.post("/api/auth/forgot-password", json={
@@ -413,27 +431,8 @@ class TestForgotPasswordEndpoint:
 
         assert response.status_code == 200
         assert "reset link" in response.json()["message"].lower()
-        mock_supabase.auth.reset_password_email.assert_called_once_with("user@example.com")
-
-    @patch('src.api.auth.supabase', None)
-    def test_forgot_password_fails_when_supabase_unavailable(self, client):
-        """Test forgot password returns success even when Supabase unavailable (security)"""
-        response = client.post("/api/auth/forgot-password", json={
-            "email": "test@example.com"
-        })
+        assert mock_supabase.auth.reset_password_email.calls == [(("user@example.com",), {})]
 
-        # Returns 200 with generic message (doesn't reveal if service is down)
-        assert response.status_code in [200, 503]
-
-    def test_forgot_password_validation_invalid_email(self, client):
-        """Test forgot password validates email format"""
-        response = client.post("/api/auth/forgot-password", json={
-            "email": "not-an-email"
-        })
-
-        assert response.status_code == 422
-
-    @patch('src.api.auth.supabase')
     def test_forgot_password_doesnt_reveal_if_email_exists(self, mock_supabase, client):
         """Test forgot password doesn't reveal if email exists (security)"""
         # Mock exception (user doesn't exist)
@@ -453,7 +452,6 @@ class TestForgotPasswordEndpoint:
 class TestResetPasswordEndpoint:
     """Test POST /api/auth/reset-password"""
 
-    @patch('src.api.auth.supabase')
     def test_reset_password_success(self, mock_supabase, client):
         """Test successful password reset"""
         response = client.post("/api/auth/reset-password", json={
@@ -462,26 +460,10 @@ class TestResetPasswordEndpoint:
 
         assert response.status_code == 200
         assert "updated" in response.json()["message"].lower()
-        mock_supabase.auth.update_user.assert_called_once_with({
+        assert mock_supabase.auth.update_user.calls == [(({
             "password": "NewSecurePass123!"
-        })
-
-    @patch('src.api.auth.supabase', None)
-    def test_reset_password_fails_when_supabase_unavailable(self, client):
-        """Test reset password fails when Supabase unavailable"""
-        response = client.post("/api/auth/reset-password", json={
-            "new_password": "NewPassword123"
-        })
-
-        assert response.status_code in [400, 503]
-
-    def test_reset_password_validation_missing_new_password(self, client):
-        """Test reset password requires new_password"""
-        response = client.post("/api/auth/reset-password", json={})
+        },), {})]
 
-        assert response.status_code == 422
-
-    @patch('src.api.auth.supabase')
     def test_reset_password_handles_exception(self, mock_supabase, client):
         """Test reset password handles Supabase exceptions"""
         mock_supabase.auth.update_user.side_effect = Exception("Password update failed")
@@ -498,7 +480,6 @@ class TestResetPasswordEndpoint:
 class TestResendVerificationEndpoint:
     """Test POST /api/auth/resend-verification"""
 
-    @patch('src.api.auth.supabase')
     def test_resend_verification_success(self, mock_supabase, client):
         """Test resend verification email"""
         response = client.post("/api/auth/resend-verification", json={
@@ -508,27 +489,8 @@ class TestResendVerificationEndpoint:
         assert response.status_code == 200
         assert "verification" in response.json()["message"].lower()
         # Uses password reset as workaround
-        mock_supabase.auth.reset_password_email.assert_called_once_with("user@example.com")
-
-    @patch('src.api.auth.supabase', None)
-    def test_resend_verification_fails_when_supabase_unavailable(self, client):
-        """Test resend verification returns success even when unavailable"""
-        response = client.post("/api/auth/resend-verification", json={
-            "email": "test@example.com"
-        })
+        assert mock_supabase.auth.reset_password_email.calls == [(("user@example.com",), {})]
 
-        # Returns 200 (doesn't reveal service status)
-        assert response.status_code in [200, 503]
-
-    def test_resend_verification_validation_invalid_email(self, client):
-        """Test resend verification validates email"""
-        response = client.post("/api/auth/resend-verification", json={
-            "email": "not-an-email"
-        })
-
-        assert response.status_code == 422
-
-    @patch('src.api.auth.supabase')
     def test_resend_verification_doesnt_reveal_if_email_exists(self, mock_supabase, client):
         """Test resend verification doesn't reveal if email exists"""
         mock_supabase.auth.reset_password_email.side_effect = Exception("User not found")
@@ -541,39 +503,89 @@ class TestResendVerificationEndpoint:
         assert response.status_code == 200
 
 
-# === Helper Function Tests (without async) ===
+# === Request Validation Tests ===
+
+class TestRequestValidation:
+    """Test auth request bodies rejected by Pydantic validation"""
+
+    @pytest.mark.parametrize("model,body", [
+        (SignUpRequest, {"email": "not-an-email", "password": TEST_PASSWORD}),
+        (SignUpRequest, {"email": TEST_EMAIL}),
+        (SignInRequest, {"email": "not-an-email", "password": TEST_PASSWORD}),
+        (SignInRequest, {"email": TEST_EMAIL}),
+        (PasswordResetRequest, {"email": "not-an-email"}),
+        (PasswordUpdateRequest, {}),
+    ], ids=[
+        "signup_invalid_email", "signup_missing_password",
+        "signin_invalid_email", "signin_missing_password",
+        "password_reset_invalid_email", "password_update_missing_new_password",
+    ])
+    def test_invalid_body_rejected(self, model, body):
+        """Test request models reject invalid emails and missing required fields"""
+        with pytest.raises(ValidationError):
+            model(**body)
+
+    def test_invalid_body_returns_422(self, client):
+        """Test a model validation error reaches the client as 422"""
+        response = client.post("/api/auth/signup", json={
+            "email": "not-an-email",
+            "password": TEST_PASSWORD
+        })
 
-class TestMigrateAnonymousData:
-    """Test migrate_anonymous_data helper function"""
+        assert response.status_code == 422
 
-    def test_migrate_cart_data(self, client):
-        """Test migration of shopping cart from anonymous to authenticated user"""
-        from src.database import get_db
 
-        anonymous_id = str(uuid.uuid4())
-        authenticated_id = str(uuid.uuid4())
+# === Supabase Unavailable Tests ===
 
-        # Create anonymous user with cart
-        with get_db() as cursor:
-            cursor.execute("""
-                INSERT INTO users (id, email, is_anonymous, created_at)
-                VALUES (%s, NULL, TRUE, CURRENT_TIMESTAMP)
-            """, (anonymous_id,))
+class TestSupabaseUnavailable:
+    """Test auth endpoints when no Supabase client is configured"""
 
-            cursor.execute("""
-                INSERT INTO shopping_carts (user_id, product_name, price, quantity)
-                VALUES (%s, 'Test Item', 9.99, 3)
-            """, (anonymous_id,))
+    @pytest.mark.usefixtures("no_supabase")
+    @pytest.mark.parametrize("path,body,statuses,detail", [
+        ("/api/auth/signup", CREDENTIALS_JSON, (503,), "unavailable"),
+        ("/api/auth/signin", CREDENTIALS_JSON, (503,), "unavailable"),
+        # Supabase check happens inside try-except, returns 400
+        ("/api/auth/signout", None, (400, 503), None),
+        # Returns 200 with generic message (doesn't reveal if service is down)
+        ("/api/auth/forgot-password", EMAIL_JSON, (200, 503), None),
+        ("/api/auth/reset-password", orjson.dumps({"new_password": "NewPassword123"}), (400, 503), None),
+        ("/api/auth/resend-verification", EMAIL_JSON, (200, 503), None),
+    ], ids=["signup", "signin", "signout", "forgot_password", "reset_password", "resend_verification"])
+    def test_request_when_supabase_unavailable(self, client, path, body, statuses, detail):
+        """Test each auth endpoint's response when the Supabase client is missing"""
+        response = client.post(path, content=body, headers=JSON_HEADERS)
+
+        assert response.status_code in statuses
+        if detail:
+            assert detail in response.json()["detail"].lower()
 
-        # Call migration via API (simulates signup with anonymous_user_id)
-        # We'll test this through the signup endpoint instead of calling function directly
-        # Since it's async and we can't easily test async functions without pytest-asyncio
 
-    def test_migration_integration_via_signup(self):
-        """Test migration works through signup endpoint"""
-        # This is tested in TestSignupEndpoint::test_signup_with_anonymous_migration
-        pass
+# === Helper Function Tests ===
+
+class TestMigrateAnonymousData:
+    """Test migrate_anonymous_data helper function"""
 
+    def test_migrate_moves_data_to_authenticated_user(self, mock_auth_db):
+        """Test migration reassigns cart, lists and recipes, then removes the anonymous user"""
+        anonymous_id = _fake_uuid()
+        authenticated_id = _fake_uuid()
+        cursor = mock_auth_db.return_value.__enter__.return_value
+
+        asyncio.run(src.api.auth.migrate_anonymous_data(anonymous_id, authenticated_id))
+
+        statements = [call.args for call in cursor.execute.call_args_list]
+        assert [params for _, params in statements] == [
+            (authenticated_id, anonymous_id),
+            (authenticated_id, anonymous_id),
+            (authenticated_id, anonymous_id),
+            (anonymous_id,),
+            (anonymous_id,),
+        ]
+        assert "INSERT INTO shopping_carts" in statements[0][0]
+        assert "UPDATE saved_lists" in statements[1][0]
+        assert "UPDATE recipes" in statements[2][0]
+        assert "DELETE FROM shopping_carts" in statements[3][0]
+        assert "DELETE FROM users" in statements[4][0]
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
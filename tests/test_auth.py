@@ -8,44 +8,29 @@ Tests for Supabase Auth integration including:
 - Anonymous user support
 """
 import pytest
-from fastapi.testclient import TestClient
-from app import app
 import uuid
 
-client = TestClient(app)
 
-
-def test_anonymous_user_can_access_cart():
+def test_anonymous_user_can_access_cart(client):
     """Anonymous users should be able to access cart without authentication"""
     response = client.get("/api/cart")
     assert response.status_code == 200
     assert "cart" in response.json()
 
 
-def test_anonymous_user_can_search():
+def test_anonymous_user_can_search(client, fake_search):
     """Anonymous users should be able to search products"""
-    import time
-    # Brief delay to ensure rate limiter reset completes
-    time.sleep(0.2)
-
+    # reset_rate_limiter (autouse) clears the limiter's storage before each test
     response = client.post("/api/search", json={
         "search_term": "apple",
         "max_results": 5
     })
 
-    # If rate limited, wait and retry (rate limiter should have reset)
-    if response.status_code == 429:
-        time.sleep(1)
-        response = client.post("/api/search", json={
-            "search_term": "apple",
-            "max_results": 5
-        })
-
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
     assert "products" in response.json()
 
 
-def test_config_endpoint_returns_public_keys():
+def test_config_endpoint_returns_public_keys(client):
     """Config endpoint should return Supabase public configuration"""
     response = client.get("/api/config")
     assert response.status_code == 200
@@ -57,7 +42,7 @@ def test_config_endpoint_returns_public_keys():
     assert "SUPABASE_SERVICE_KEY" not in str(data)
 
 
-def test_auth_me_without_token_returns_anonymous():
+def test_auth_me_without_token_returns_anonymous(client):
     """GET /api/auth/me without token should return anonymous user"""
     response = client.get("/api/auth/me")
     assert response.status_code == 200
@@ -66,7 +51,7 @@ def test_auth_me_without_token_returns_anonymous():
     assert data["email"] is None
 
 
-def test_invalid_token_returns_401():
+def test_invalid_token_returns_401(client):
     """Invalid JWT token should return 401 Unauthorized"""
     fake_token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.fake.signature"
     response = client.get(
@@ -76,7 +61,7 @@ def test_invalid_token_returns_401():
     assert response.status_code == 401
 
 
-def test_cart_add_requires_valid_product():
+def test_cart_add_requires_valid_product(client):
     """Adding to cart should validate product data"""
     response = client.post("/api/cart/add", json={
         "name": "Test Product",
@@ -88,14 +73,14 @@ def test_cart_add_requires_valid_product():
     assert response.json()["success"] == True
 
 
-def test_frequent_items_requires_auth():
+def test_frequent_items_requires_auth(client):
     """Frequent items endpoint should work for anonymous users (returns empty)"""
     response = client.get("/api/frequent")
     assert response.status_code == 200
     assert "items" in response.json()
 
 
-def test_sql_injection_in_cart_add():
+def test_sql_injection_in_cart_add(client):
     """SQL injection attempts should be safely handled"""
     response = client.post("/api/cart/add", json={
         "name": "'; DROP TABLE users; --",
@@ -103,7 +88,7 @@ def test_sql_injection_in_cart_add():
         "quantity": 1
     })
     # Should either succeed (parameterized) or fail safely
-    assert response.status_code in [200, 400, 422]
+    assert response.status_code in (200, 400, 422)
     # Verify users table still exists by making another request
     verify = client.get("/api/cart")
     assert verify.status_code == 200
@@ -115,32 +100,32 @@ def test_sql_injection_in_cart_add():
 class TestAuthEndpoints:
     """Test auth endpoint structure (without real Supabase calls)"""
 
-    def test_signup_endpoint_exists(self):
+    def test_signup_endpoint_exists(self, client):
         """Signup endpoint should exist"""
         # Will fail without real credentials, but endpoint should exist
         response = client.post("/api/auth/signup", json={
             "email": "test@example.com",
             "password": "password123"
         })
-        # 400 or 503 is fine (no real Supabase), 404 would be bad
-        assert response.status_code != 404
+        # 400 or 503 is fine (no real Supabase); 404 or 500 would be bad
+        assert response.status_code in (200, 400, 503)
 
-    def test_signin_endpoint_exists(self):
+    def test_signin_endpoint_exists(self, client):
         """Signin endpoint should exist"""
         response = client.post("/api/auth/signin", json={
             "email": "test@example.com",
             "password": "password123"
         })
-        # 401 or 503 is fine, 404 would be bad
-        assert response.status_code != 404
+        # 401 or 503 is fine; 404 or 500 would be bad
+        assert response.status_code in (401, 503)
 
-    def test_forgot_password_endpoint_exists(self):
+    def test_forgot_password_endpoint_exists(self, client):
         """Forgot password endpoint should exist"""
         response = client.post("/api/auth/forgot-password", json={
             "email": "test@example.com"
         })
-        # Any response except 404 is fine
-        assert response.status_code != 404
+        # Always 200 so the response doesn't reveal whether the email exists
+        assert response.status_code in (200, 503)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Database operations tests
 Tests for all database CRUD operations, transactions, and error handling.
 """
 import pytest
+import uuid
 from unittest.mock import patch, MagicMock
 from src.database import (
     get_user_cart,
@@ -19,6 +20,8 @@ from src.database import (
     cleanup_stale_anonymous_users,
     get_anonymous_user_stats,
     get_user_recipes,
+    get_user_recipe,
+    user_owns_recipe,
     create_recipe,
     save_cart_as_recipe,
     add_item_to_recipe,
@@ -421,6 +424,13 @@ class TestRecipeOperations:
         assert recipes[0]['item_count'] == 3
         assert len(recipes[0]['items']) == 3
 
+    def test_save_empty_cart_as_recipe_fails(self, test_anonymous_user):
+        """Test saving an empty cart raises and leaves no recipe behind"""
+        with pytest.raises(ValueError, match="Cart is empty"):
+            save_cart_as_recipe(test_anonymous_user, "Empty", store_number=86)
+
+        assert get_user_recipes(test_anonymous_user, store_number=86) == []
+
     def test_get_user_recipes_empty(self, test_anonymous_user):
         """Test getting recipes when user has none"""
         recipes = get_user_recipes(test_anonymous_user, store_number=86)
@@ -444,17 +454,46 @@ class TestRecipeOperations:
         assert 'price' in item
         assert 'quantity' in item
 
+    def test_get_user_recipe(self, test_anonymous_user, test_products):
+        """Test getting a single recipe with its items"""
+        for product in test_products:
+            add_to_cart(test_anonymous_user, product, quantity=1, store_number=86)
+        recipe_id = save_cart_as_recipe(test_anonymous_user, "Test Recipe", store_number=86)
+
+        recipe = get_user_recipe(test_anonymous_user, recipe_id, store_number=86)
+        assert recipe['id'] == recipe_id
+        assert recipe['name'] == "Test Recipe"
+        assert len(recipe['items']) == 3
+
+    def test_get_user_recipe_not_found(self, test_anonymous_user):
+        """Test unknown ids, other stores, and other users get None"""
+        recipe_id = create_recipe(test_anonymous_user, "Test Recipe", store_number=86)
+
+        assert get_user_recipe(test_anonymous_user, 999999, store_number=86) is None
+        assert get_user_recipe(test_anonymous_user, recipe_id, store_number=101) is None
+        assert get_user_recipe(str(uuid.uuid4()), recipe_id, store_number=86) is None
+
+    def test_user_owns_recipe(self, test_anonymous_user):
+        """Test ownership check matches recipe id, user, and store"""
+        recipe_id = create_recipe(test_anonymous_user, "Test Recipe", store_number=86)
+
+        assert user_owns_recipe(test_anonymous_user, recipe_id, store_number=86) is True
+        assert user_owns_recipe(test_anonymous_user, 999999, store_number=86) is False
+        assert user_owns_recipe(test_anonymous_user, recipe_id, store_number=101) is False
+        assert user_owns_recipe(str(uuid.uuid4()), recipe_id, store_number=86) is False
+
     def test_add_item_to_recipe(self, test_anonymous_user, test_cart_item):
         """Test adding item to existing recipe"""
         # Create empty recipe
         recipe_id = create_recipe(test_anonymous_user, "Test Recipe", store_number=86)
 
         # Add item
-        add_item_to_recipe(recipe_id, test_cart_item)
+        item_id = add_item_to_recipe(recipe_id, test_cart_item)
 
         # Verify item was added
         recipes = get_user_recipes(test_anonymous_user, store_number=86)
         assert recipes[0]['item_count'] == 1
+        assert recipes[0]['items'][0]['id'] == item_id
         assert recipes[0]['items'][0]['product_name'] == "Test Product"
 
     def test_update_recipe_item_quantity(self, test_anonymous_user, test_cart_item):
@@ -651,7 +690,6 @@ class TestRecipeOperations:
         create_recipe(test_anonymous_user, "User 1 Recipe", store_number=86)
 
         # Try to load with different user
-        import uuid
         different_user = str(uuid.uuid4())
 
         with pytest.raises(ValueError, match="Recipe not found"):
@@ -663,7 +701,6 @@ class TestStaleUserCleanup:
 
     def test_cleanup_stale_anonymous_users_with_data(self):
         """Test cleanup deletes stale users with no activity"""
-        import uuid
         from src.database import get_db
 
         # Create a stale user (60 days old, no activity)
@@ -687,7 +724,6 @@ class TestStaleUserCleanup:
 
     def test_cleanup_preserves_users_with_activity(self, test_anonymous_user, test_cart_item):
         """Test cleanup doesn't delete users with cart items"""
-        import uuid
         from src.database import get_db
 
         # Create stale user WITH cart items
@@ -711,7 +747,6 @@ class TestStaleUserCleanup:
 
     def test_cleanup_preserves_users_with_lists(self, test_anonymous_user):
         """Test cleanup doesn't delete users with saved lists"""
-        import uuid
         from src.database import get_db
 
         # Create stale user WITH saved list
@@ -735,7 +770,6 @@ class TestStaleUserCleanup:
 
     def test_cleanup_preserves_users_with_recipes(self):
         """Test cleanup doesn't delete users with recipes"""
-        import uuid
         from src.database import get_db
 
         # Create stale user WITH recipe
@@ -123,6 +123,19 @@ Sauce:
         result = parse_recipe_text(text)
         assert isinstance(result, list)
 
+    def test_repeated_parse_returns_independent_copies(self):
+        """Cached results can be mutated without affecting later calls"""
+        text = "2 cups flour\n1 tsp salt"
+
+        first = parse_recipe_text(text)
+        first[0]['name'] = 'mutated'
+        first.append({'name': 'extra'})
+
+        second = parse_recipe_text(text)
+
+        assert len(second) == 2
+        assert second[0]['name'] == 'flour'
+
 
 class TestParseIngredientLine:
     """Test single ingredient line parsing"""
@@ -307,6 +320,7 @@ class TestSectionHeaders:
         assert is_generic_header("Ingredients")
         assert is_generic_header("You will need")
         assert is_generic_header("You'll need")
+        assert is_generic_header("You\u2019ll need")  # curly apostrophe from copy/paste
         assert is_generic_header("Ingredients:")
 
 